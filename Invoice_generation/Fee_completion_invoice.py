@@ -1,179 +1,207 @@
 import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from reportlab.platypus import Paragraph, Spacer
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
+import sys
+import importlib.util
+from collections import deque
+from itertools import islice
+from invoice_output import write_pdf, content_hash, render_incremental, iter_items
+from invoice_renderer import InvoiceRenderer, Bookmark
+from invoice_canvas import CanvasInvoiceRenderer
+
+# Columns used from each fee sheet; anything else in the workbook is skipped
+FEE_COLUMNS = ('Student', 'Date', 'Fee', 'Paid', 'Remaining')
+
+# Forking a process that is running other threads (Streamlit, background jobs) can
+# deadlock the children; start render workers from a clean forkserver where available
+POOL_CONTEXT = multiprocessing.get_context("forkserver") if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+# python-calamine (Rust) parses .xlsx/.xls far faster than openpyxl; use it when installed
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Students per worker task when rendering a stream, whose length is not known up front
+STREAM_CHUNK = 8
+
+# Styles, table styles and header/footer are built once per process and shared by every invoice
+RENDERER = InvoiceRenderer()
+CANVAS_RENDERER = CanvasInvoiceRenderer()
+
+def read_workbook(excel_file, engine=EXCEL_ENGINE):
+    """Parse every sheet of the fee workbook in a single pass.
+    Returns {sheet name: DataFrame} in workbook order, limited to FEE_COLUMNS."""
+    return pd.read_excel(
+        excel_file,
+        sheet_name=None,
+        engine=engine,
+        usecols=lambda col: col in FEE_COLUMNS,
+        dtype={'Student': object},
+    )
+
+def iter_workbook(excel_file, engine=EXCEL_ENGINE):
+    """Yield (sheet name, DataFrame) one sheet at a time, in workbook order, limited to FEE_COLUMNS.
+
+    The workbook is opened once (openpyxl in read-only mode, or calamine), and each
+    sheet is only parsed when the consumer asks for it, so at most one sheet is held
+    as a DataFrame however many sheets the workbook has.
+    """
+    with pd.ExcelFile(excel_file, engine=engine) as workbook:
+        for sheet_name in workbook.sheet_names:
+            yield sheet_name, workbook.parse(
+                sheet_name,
+                usecols=lambda col: col in FEE_COLUMNS,
+                dtype={'Student': object},
+            )
 
 def read_student_data(excel_file, detailed_report=False):
     """Read student data from all sheets in Excel file"""
-    students_fees = {}
+    # Read all sheets from Excel file (the archive is opened and parsed once)
+    return summarize_student_fees(read_workbook(excel_file), detailed_report)
+
+def iter_sheet_fees(excel_file, detailed_report=False):
+    """Yield (sheet name, {student: fees}) one sheet at a time, in workbook order"""
+    for sheet_name, df in iter_workbook(excel_file):
+        yield sheet_name, summarize_student_fees({sheet_name: df}, detailed_report)
+
+def iter_student_fees(excel_file, detailed_report=False):
+    """Yield (student name, fees) pairs as read_student_data would return them, sheet by sheet.
+
+    Only the sheet being summarised (and its students' payment histories) is in
+    memory at a time, so invoices can be rendered from a workbook of any size.
+    Unlike the dict, a name that appears in several sheets is yielded once per sheet;
+    detailed invoice file names include the class, so both get their own invoice.
+    """
+    for _, students_fees in iter_sheet_fees(excel_file, detailed_report):
+        yield from students_fees.items()
+
+def clean_fee_sheet(df):
+    """One fee sheet with student names filled down, Date parsed and Fee/Paid/Remaining numeric"""
+    # Forward fill student names (fills NaN with previous valid student name)
+    df['Student'] = df['Student'].ffill()
     
-    # Read all sheets from Excel file
-    excel = pd.ExcelFile(excel_file)
+    # Drop rows with no student at all
+    df = df.dropna(subset=['Student'], how='all')
     
-    for sheet_name in excel.sheet_names:
-        df = pd.read_excel(excel_file, sheet_name=sheet_name)
-        
-        # Forward fill student names (fills NaN with previous valid student name)
-        df['Student'] = df['Student'].ffill()
-        
-        # Drop rows with no student at all
-        df = df.dropna(subset=['Student'], how='all')
+    # Ensure Date is datetime
+    df['Date'] = pd.to_datetime(df.get('Date'), dayfirst=True, errors='coerce')
+    
+    # Coerce numeric columns
+    for col in ('Fee', 'Remaining', 'Paid'):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        else:
+            df[col] = pd.Series([pd.NA] * len(df))
+    return df
+
+def summarize_student_fees(sheets, detailed_report=False):
+    """Fee totals (and optionally payment history) per student from {sheet name: DataFrame}"""
+    students_fees = {}
+    
+    for sheet_name, df in sheets.items():
+        df = clean_fee_sheet(df)
         
-        # Ensure Date is datetime
-        df['Date'] = pd.to_datetime(df.get('Date'), dayfirst=True, errors='coerce')
+        # Aggregate every student of the sheet in one grouped pass
+        # (sort=False keeps students in order of first appearance)
+        grouped = df.groupby('Student', sort=False)
+        total_fees = grouped['Fee'].first().astype(float).fillna(0.0)     # first non-null Fee
+        paid_sum = grouped['Paid'].sum().astype(float)                    # sum of Paid column (most reliable)
+        remaining_fees = grouped['Remaining'].last().astype(float)        # last non-null Remaining
+        remaining_fees = remaining_fees.fillna((total_fees - paid_sum).clip(lower=0.0))
+        # Final paid_fees: prefer explicit sum, else fallback
+        paid_fees = paid_sum.where(paid_sum > 0, (total_fees - remaining_fees).clip(lower=0.0))
         
-        # Coerce numeric columns
-        for col in ('Fee', 'Remaining', 'Paid'):
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            else:
-                df[col] = pd.Series([pd.NA] * len(df))
+        # Create payment history if detailed report is requested
+        payment_history = {}
+        if detailed_report and 'Paid' in df.columns:
+            paid_rows = df[df['Paid'].notna() & (df['Paid'] > 0)]
+            # Missing or unparseable dates print as 'NaT', as str() of the parsed value always did
+            date_strs = pd.to_datetime(paid_rows['Date'], errors='coerce').dt.strftime('%d-%m-%Y').fillna('NaT')
+            for student, date_str, amount in zip(paid_rows['Student'], date_strs, paid_rows['Paid']):
+                payment_history.setdefault(student, []).append({
+                    'date': date_str,
+                    'amount': float(amount)
+                })
         
-        # Process each student in the sheet
-        for student_name in df['Student'].unique():
-            student_data = df[df['Student'] == student_name].copy()
-            student_name = str(student_name).strip()
-            
-            # Total fees: first non-null Fee
-            fee_vals = student_data['Fee'].dropna()
-            total_fees = float(fee_vals.iloc[0]) if not fee_vals.empty else 0.0
-            
-            # Total paid: sum of Paid column (most reliable)
-            paid_sum = float(student_data['Paid'].dropna().sum()) if not student_data['Paid'].dropna().empty else 0.0
-            
-            # Remaining: last non-null Remaining if present, else infer from total - paid_sum
-            rem_vals = student_data['Remaining'].dropna()
-            if not rem_vals.empty:
-                remaining_fees = float(rem_vals.iloc[-1])
-            else:
-                remaining_fees = max(total_fees - paid_sum, 0.0)
-            
-            # Final paid_fees: prefer explicit sum, else fallback
-            paid_fees = paid_sum if paid_sum > 0 else max(total_fees - remaining_fees, 0.0)
-            
-            # Create payment history if detailed report is requested
-            payment_history = []
-            if detailed_report and 'Paid' in student_data.columns:
-                paid_rows = student_data[student_data['Paid'].notna() & (student_data['Paid'] > 0)]
-                for _, row in paid_rows.iterrows():
-                    dt = row['Date']
-                    date_str = dt.strftime('%d-%m-%Y') if not pd.isna(dt) else str(row.get('Date'))
-                    payment_history.append({
-                        'date': date_str,
-                        'amount': float(row['Paid'])
-                    })
-            
-            students_fees[student_name] = {
+        for student, total, paid, remaining in zip(total_fees.index, total_fees.to_numpy(), paid_fees.to_numpy(), remaining_fees.to_numpy()):
+            students_fees[str(student).strip()] = {
                 'class_name': sheet_name,
-                'total_fees': total_fees,
-                'paid_fees': paid_fees,
-                'remaining_fees': remaining_fees,
-                'payment_history': payment_history if detailed_report else None
+                'total_fees': float(total),
+                'paid_fees': float(paid),
+                'remaining_fees': float(remaining),
+                'payment_history': payment_history.get(student, []) if detailed_report else None
             }
     
     return students_fees
 
-def generate_invoice(student_name, fees_data):
-    # Create output directory if it doesn't exist
-    output_dir = "invoices"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create PDF document
-    invoice_file = os.path.join(output_dir, f"Adhyay_Academy_{student_name.replace(' ', '_')}_Invoice.pdf")
-    doc = SimpleDocTemplate(invoice_file, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title Style
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=16,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.HexColor("#2E4053"),
-    )
+def invoice_filename(student_name):
+    return f"Adhyay_Academy_{student_name.replace(' ', '_')}_Invoice.pdf"
 
-    # Header
-    elements.append(Paragraph("<b>Adhyay Academy</b>", title_style))
-    elements.append(Paragraph("<b>Student Fee Invoice</b>", title_style))
-    elements.append(Spacer(1, 20))
+def detailed_invoice_filename(student_name, class_name):
+    # The class keeps apart students of the same name in different sheets
+    return f"Adhyay_Academy_{str(class_name).replace(' ', '_')}_{student_name.replace(' ', '_')}_Detailed_Invoice.pdf"
 
-    # Invoice Info
-    date_today = datetime.today().strftime("%d-%m-%Y")
-    info_style = styles["Normal"]
-    elements.append(Paragraph(f"<b>Student Name:</b> {student_name}", info_style))
-    elements.append(Paragraph(f"<b>Class:</b> {fees_data['class_name']}", info_style))
-    elements.append(Paragraph(f"<b>Invoice Date:</b> {date_today}", info_style))
-    elements.append(Spacer(1, 20))
+def merged_invoice_filename():
+    return f"Adhyay_Academy_All_Detailed_Invoices_{datetime.today().strftime('%Y%m%d')}.pdf"
 
-    # Fee Details Table
-    data = [
+def combined_invoice_filename():
+    return f"Adhyay_Academy_Combined_Invoice_{datetime.today().strftime('%Y%m%d')}.pdf"
+
+INVOICE_TITLE = "Student Fee Invoice"
+INVOICE_NOTE = "This is a system-generated invoice from Adhyay Academy."
+
+def invoice_info(student_name, fees_data):
+    """(label, value) info lines of a student's fee invoice"""
+    return [
+        ("Student Name", student_name),
+        ("Class", fees_data['class_name']),
+        ("Invoice Date", datetime.today().strftime("%d-%m-%Y")),
+    ]
+
+def invoice_rows(fees_data):
+    """Fee details table rows of a student's fee invoice"""
+    return [
         ["Description", "Amount (Rs.)"],
         ["Total Fees", f"{fees_data['total_fees']:,.2f}"],
         ["Paid Fees", f"{fees_data['paid_fees']:,.2f}"],
         ["Remaining Fees", f"{fees_data['remaining_fees']:,.2f}"]
     ]
 
-    table = Table(data, colWidths=[300, 200])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#34495E")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#EAECEE"))
-    ]))
-    elements.append(table)
-
-    # Footer
-    elements.append(Spacer(1, 30))
-    elements.append(Paragraph(
-        "<b>Note:</b> This is a system-generated invoice from Adhyay Academy.",
-        styles["Italic"]
-    ))
-
-    # Build PDF
-    doc.build(elements)
-    print(f"Generated invoice for {student_name} ({fees_data['class_name']}): {invoice_file}")
-
-def generate_detailed_invoice(student_name, fees_data):
-    """Generate detailed invoice with payment history for a student"""
-    output_dir = "invoices/detailed"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    invoice_file = os.path.join(output_dir, f"Adhyay_Academy_{student_name.replace(' ', '_')}_Detailed_Invoice.pdf")
-    doc = SimpleDocTemplate(invoice_file, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title Style
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=16,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.HexColor("#2E4053"),
-    )
+def render_invoice(student_name, fees_data, fast=False):
+    """Render the fee invoice for a student in memory and return the PDF bytes.
+    fast draws the fixed layout straight on a canvas instead of through platypus."""
+    info = invoice_info(student_name, fees_data)
+    data = invoice_rows(fees_data)
+    if fast:
+        return CANVAS_RENDERER.render(INVOICE_TITLE, info, 20, data, [300, 200], 'invoice', INVOICE_NOTE)
 
-    # Header
-    elements.append(Paragraph("<b>Adhyay Academy</b>", title_style))
-    elements.append(Paragraph("<b>Student Fee Detailed Report</b>", title_style))
+    # Invoice Info, then the Fee Details Table
+    elements = [RENDERER.info(label, value) for label, value in info]
     elements.append(Spacer(1, 20))
+    elements.append(RENDERER.table(data, [300, 200], 'invoice'))
+    return RENDERER.render(INVOICE_TITLE, elements, INVOICE_NOTE)
+
+def generate_invoice(student_name, fees_data, output_dir="invoices", fast=False):
+    invoice_file = write_pdf(render_invoice(student_name, fees_data, fast), output_dir, invoice_filename(student_name))
+    print(f"Generated invoice for {student_name} ({fees_data['class_name']}): {invoice_file}")
+    return invoice_file
+
+DETAILED_TITLE = "Student Fee Detailed Report"
+DETAILED_NOTE = "This is a detailed fee report generated by Adhyay Academy."
 
+def detailed_invoice_body(student_name, fees_data):
+    """Flowables between the header and footer of a student's detailed invoice"""
     # Student Info
-    info_style = styles["Normal"]
-    elements.append(Paragraph(f"<b>Student Name:</b> {student_name}", info_style))
-    elements.append(Paragraph(f"<b>Class:</b> {fees_data['class_name']}", info_style))
-    elements.append(Paragraph(f"<b>Report Date:</b> {datetime.today().strftime('%d-%m-%Y')}", info_style))
-    elements.append(Spacer(1, 20))
+    elements = [
+        RENDERER.info("Student Name", student_name),
+        RENDERER.info("Class", fees_data['class_name']),
+        RENDERER.info("Report Date", datetime.today().strftime('%d-%m-%Y')),
+        Spacer(1, 20),
+    ]
 
     # Current Status Table
-    elements.append(Paragraph("<b>Current Status:</b>", info_style))
+    elements.append(Paragraph("<b>Current Status:</b>", RENDERER.info_style))
     elements.append(Spacer(1, 10))
     
     current_data = [
@@ -182,21 +210,12 @@ def generate_detailed_invoice(student_name, fees_data):
         ["Total Fees Paid", f"{fees_data['paid_fees']:,.2f}"],
         ["Balance Remaining", f"{fees_data['remaining_fees']:,.2f}"]
     ]
-
-    current_table = Table(current_data, colWidths=[300, 200])
-    current_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#34495E")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    elements.append(current_table)
+    elements.append(RENDERER.table(current_data, [300, 200], 'detailed'))
     elements.append(Spacer(1, 20))
 
     # Payment History Table (date + amount only)
     if fees_data['payment_history']:
-        elements.append(Paragraph("<b>Payment History:</b>", info_style))
+        elements.append(Paragraph("<b>Payment History:</b>", RENDERER.info_style))
         elements.append(Spacer(1, 10))
         
         history_data = [["Date", "Amount Paid (Rs.)"]]
@@ -205,147 +224,223 @@ def generate_detailed_invoice(student_name, fees_data):
                 payment['date'],
                 f"{payment['amount']:,.2f}"
             ])
+        elements.append(RENDERER.table(history_data, [200, 300], 'detailed'))
+
+    return elements
 
-        history_table = Table(history_data, colWidths=[200, 300])
-        history_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#34495E")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        elements.append(history_table)
-
-    # Footer
-    elements.append(Spacer(1, 30))
-    elements.append(Paragraph(
-        "<b>Note:</b> This is a detailed fee report generated by Adhyay Academy.",
-        styles["Italic"]
-    ))
-
-    # Build PDF
-    doc.build(elements)
+def render_detailed_invoice(student_name, fees_data):
+    """Render the detailed invoice with payment history in memory and return the PDF bytes"""
+    return RENDERER.render(DETAILED_TITLE, detailed_invoice_body(student_name, fees_data), DETAILED_NOTE)
+
+def generate_detailed_invoice(student_name, fees_data, output_dir="invoices/detailed"):
+    """Generate detailed invoice with payment history for a student"""
+    invoice_file = write_pdf(render_detailed_invoice(student_name, fees_data), output_dir,
+                             detailed_invoice_filename(student_name, fees_data['class_name']))
     print(f"Generated detailed invoice for {student_name}: {invoice_file}")
     return invoice_file
 
-def generate_combined_invoice(students_fees):
-    """Generate a single combined invoice for all students"""
-    output_dir = "invoices"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create PDF document
-    invoice_file = os.path.join(output_dir, f"Adhyay_Academy_Combined_Invoice_{datetime.today().strftime('%Y%m%d')}.pdf")
-    doc = SimpleDocTemplate(invoice_file, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title Style
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=16,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.HexColor("#2E4053"),
+def render_detailed_chunk(students):
+    """(file name, PDF bytes) for a list of (student name, fees) pairs; one worker task"""
+    return [(detailed_invoice_filename(name, data['class_name']), render_detailed_invoice(name, data)) for name, data in students]
+
+def render_detailed_invoices(students_fees, workers=None):
+    """Render detailed invoices for all students, spread across worker processes.
+
+    students_fees is the {student: fees} dict or any iterable of (student, fees)
+    pairs, such as iter_student_fees. Each student is rendered independently, so
+    invoices are fanned out over a ProcessPoolExecutor (workers=None uses every
+    core, workers=1 renders in this process). Yields (file name, PDF bytes) in
+    input order as results come back, so callers can stream them into a ZIP or
+    onto disk one at a time.
+
+    Only a couple of batches per worker are in flight at once, and students are
+    pulled from the input as batches are handed out, so a streamed input is never
+    read further ahead than the workers can use.
+    """
+    workers = workers or os.cpu_count() or 1
+    if isinstance(students_fees, dict):
+        if len(students_fees) < 2:
+            workers = 1
+        # Batch several students per task so pickling overhead stays small
+        chunksize = max(1, len(students_fees) // (workers * 4))
+    else:
+        chunksize = STREAM_CHUNK
+    students = iter(iter_items(students_fees))
+
+    if workers == 1:
+        for name, data in students:
+            yield detailed_invoice_filename(name, data['class_name']), render_detailed_invoice(name, data)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT)
+    in_flight = deque()
+    try:
+        for chunk in iter(lambda: list(islice(students, chunksize)), []):
+            in_flight.append(executor.submit(render_detailed_chunk, chunk))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+    finally:
+        # Drop queued work if the consumer stops early (e.g. a cancelled background job)
+        executor.shutdown(cancel_futures=True)
+
+def detailed_invoice_hash(student_name, fees_data):
+    """Content hash of everything printed on a student's detailed invoice, the Report Date
+    included, so a PDF kept on disk is only reused on the day it was rendered"""
+    return content_hash("detailed", student_name, fees_data, datetime.today().strftime('%d-%m-%Y'))
+
+def detailed_invoice_key(student_name, fees_data):
+    """Manifest entry of a student's detailed invoice: its file name, unique per class and student"""
+    return detailed_invoice_filename(student_name, fees_data['class_name'])
+
+def render_detailed_invoices_incremental(students_fees, output_dir="invoices/detailed", workers=None):
+    """Like render_detailed_invoices, but only students whose fee data changed since
+    the last run into output_dir are rendered (and written there); the others are
+    read back from disk, as recorded in output_dir's invoice manifest."""
+    return render_incremental(
+        students_fees, output_dir, detailed_invoice_hash,
+        lambda changed: render_detailed_invoices(changed, workers=workers),
+        manifest_key=detailed_invoice_key
     )
 
-    # Header
-    elements.append(Paragraph("<b>Adhyay Academy</b>", title_style))
-    elements.append(Paragraph("<b>Combined Fee Status Report</b>", title_style))
-    elements.append(Spacer(1, 20))
+def generate_detailed_invoices(students_fees, workers=None, output_dir="invoices/detailed", incremental=True):
+    """Render detailed invoices in parallel and write them to output_dir.
+    students_fees: the {student: fees} dict or a stream of (student, fees) pairs.
+    With incremental=True, invoices whose data is unchanged since the last run are kept as they are.
+    Returns the file paths in students_fees order."""
+    if incremental:
+        paths = [os.path.join(output_dir, filename)
+                 for filename, _ in render_detailed_invoices_incremental(students_fees, output_dir, workers=workers)]
+    else:
+        paths = [write_pdf(pdf_bytes, output_dir, filename)
+                 for filename, pdf_bytes in render_detailed_invoices(students_fees, workers=workers)]
+    print(f"Generated {len(paths)} detailed invoices in {output_dir}")
+    return paths
 
-    # Date
-    date_today = datetime.today().strftime("%d-%m-%Y")
-    elements.append(Paragraph(f"<b>Date:</b> {date_today}", styles["Normal"]))
-    elements.append(Spacer(1, 20))
+def render_merged_detailed_invoices(students_fees):
+    """Render every student's detailed invoice into one printable PDF and return the bytes.
 
-    # Create table data
-    data = [["Student Name", "Class", "Total Fees (Rs.)", "Paid Fees (Rs.)", "Remaining (Rs.)"]]
-    
-    # Group students by class and sort within each class
+    students_fees: the {student: fees} dict or a stream of (student, fees) pairs.
+    Students are grouped by class (classes and names sorted, as in the combined
+    report); each invoice starts on a new page. The PDF outline has one bookmark
+    per class with a bookmark per student beneath it.
+    """
     class_groups = {}
-    for student_name, info in students_fees.items():
-        class_name = info['class_name']
-        if class_name not in class_groups:
-            class_groups[class_name] = []
-        class_groups[class_name].append((student_name, info))
-    
-    # Add student rows - sorted by class, then by student name
-    total_fees = paid_fees = remaining_fees = 0
-    for class_name in sorted(class_groups.keys()):
-        # Sort students within each class
-        students = sorted(class_groups[class_name])
-        for student_name, info in students:
-            data.append([
-                student_name,
-                info['class_name'],
-                f"{info['total_fees']:,.2f}",
-                f"{info['paid_fees']:,.2f}",
-                f"{info['remaining_fees']:,.2f}"
-            ])
-            total_fees += info['total_fees']
-            paid_fees += info['paid_fees']
-            remaining_fees += info['remaining_fees']
-    
-    # Add summary row
-    data.append([
-        "TOTAL (Rs.)",
-        "",
-        f"{total_fees:,.2f}",
-        f"{paid_fees:,.2f}",
-        f"{remaining_fees:,.2f}"
-    ])
-
-    # Create and style table
-    table = Table(data, colWidths=[120, 80, 100, 100, 100])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#34495E")),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor("#EAECEE")),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-    ]))
-    elements.append(table)
-
-    # Footer
-    elements.append(Spacer(1, 30))
-    elements.append(Paragraph(
-        "<b>Note:</b> This is a system-generated report for administrative purposes.",
-        styles["Italic"]
-    ))
-
-    # Build PDF
-    doc.build(elements)
+    for student_name, info in iter_items(students_fees):
+        class_groups.setdefault(info['class_name'], {})[student_name] = info
+
+    documents = []
+    for class_index, class_name in enumerate(sorted(class_groups)):
+        students = class_groups[class_name]
+        for student_index, student_name in enumerate(sorted(students)):
+            bookmarks = [Bookmark(f"student-{class_index}-{student_index}", student_name, level=1)]
+            if student_index == 0:
+                bookmarks.insert(0, Bookmark(f"class-{class_index}", str(class_name), level=0))
+            body = detailed_invoice_body(student_name, students[student_name])
+            documents.append(bookmarks + RENDERER.document(DETAILED_TITLE, body, DETAILED_NOTE, as_form=True))
+
+    return RENDERER.render_merged(documents)
+
+def generate_merged_detailed_invoices(students_fees, output_dir="invoices"):
+    """Generate one PDF holding every student's detailed invoice, for printing"""
+    students_fees = list(iter_items(students_fees))
+    invoice_file = write_pdf(render_merged_detailed_invoices(students_fees), output_dir, merged_invoice_filename())
+    print(f"Generated merged detailed invoices for {len(students_fees)} students: {invoice_file}")
+    return invoice_file
+
+COMBINED_HEADER = ["Student Name", "Class", "Total Fees (Rs.)", "Paid Fees (Rs.)", "Remaining (Rs.)"]
+COMBINED_COL_WIDTHS = [120, 80, 100, 100, 100]
+
+class CombinedReport:
+    """Class sections of the combined report, collected one student at a time.
+
+    Only each student's three amounts are kept (no payment history), so the report
+    can be filled from the same pass over iter_student_fees that renders the
+    detailed invoices:
+
+        report = CombinedReport()
+        generate_detailed_invoices(report.collect(iter_student_fees(excel_file, True)))
+        generate_combined_invoice(report)
+    """
+
+    def __init__(self):
+        self.classes = {}  # class name -> {student: (total, paid, remaining)}
+
+    def add(self, student_name, fees_data):
+        self.classes.setdefault(fees_data['class_name'], {})[student_name] = (
+            fees_data['total_fees'], fees_data['paid_fees'], fees_data['remaining_fees']
+        )
+
+    def collect(self, students_fees):
+        """Yield the (student, fees) pairs of students_fees, adding each to the report on the way"""
+        for student_name, fees_data in iter_items(students_fees):
+            self.add(student_name, fees_data)
+            yield student_name, fees_data
+
+    def __len__(self):
+        return sum(len(students) for students in self.classes.values())
+
+    def render(self):
+        """Render the combined invoice in memory and return the PDF bytes.
+
+        One section per class (classes and names sorted), each closed by a class
+        subtotal, then the grand total. Sections are laid out as LongTables of
+        bounded size with the header repeated on every page, so large rosters
+        render in roughly linear time.
+        """
+        # Date
+        date_today = datetime.today().strftime("%d-%m-%Y")
+        elements = [RENDERER.info("Date", date_today), Spacer(1, 20)]
+
+        def class_rows(class_name, students):
+            # Generator, so long_tables builds one chunk of row lists at a time
+            for student_name in students:
+                yield [student_name, class_name] + [f"{amount:,.2f}" for amount in students[student_name]]
+
+        grand_total = [0.0, 0.0, 0.0]
+        for class_name in sorted(self.classes.keys()):
+            # Sort students within each class
+            students = {name: self.classes[class_name][name] for name in sorted(self.classes[class_name])}
+            class_total = [sum(amounts[i] for amounts in students.values()) for i in range(3)]
+            subtotal_row = ["Subtotal", str(class_name)] + [f"{amount:,.2f}" for amount in class_total]
+            elements.extend(RENDERER.long_tables(
+                COMBINED_HEADER, class_rows(class_name, students), COMBINED_COL_WIDTHS, 'combined_rows',
+                total_row=subtotal_row, total_style='combined'
+            ))
+            elements.append(Spacer(1, 12))
+            grand_total = [total + amount for total, amount in zip(grand_total, class_total)]
+
+        # Add summary row
+        total_row = ["TOTAL (Rs.)", ""] + [f"{amount:,.2f}" for amount in grand_total]
+        elements.append(RENDERER.table([total_row], COMBINED_COL_WIDTHS, 'combined_total'))
+
+        return RENDERER.render(
+            "Combined Fee Status Report", elements,
+            "This is a system-generated report for administrative purposes."
+        )
+
+def render_combined_invoice(students_fees):
+    """Render the combined invoice for all students in memory and return the PDF bytes.
+    students_fees: the {student: fees} dict, a stream of (student, fees) pairs, or a
+    CombinedReport already filled by collect()."""
+    report = students_fees
+    if not isinstance(report, CombinedReport):
+        report = CombinedReport()
+        for student_name, fees_data in iter_items(students_fees):
+            report.add(student_name, fees_data)
+    return report.render()
+
+def generate_combined_invoice(students_fees, output_dir="invoices"):
+    """Generate a single combined invoice for all students"""
+    invoice_file = write_pdf(render_combined_invoice(students_fees), output_dir, combined_invoice_filename())
     print(f"Generated combined invoice: {invoice_file}")
     return invoice_file
 
-if __name__ == "__main__":
-    # Configuration
-    excel_file = "C:\\Users\\DELL\\Downloads\\AA Fee.xlsx"
-    generate_combined = True    # Set to True to generate combined invoice
-    generate_detailed = True    # Set to True to generate detailed reports
+def main(argv=None):
+    """Command-line entry point for student invoices; see invoice_cli for the options"""
+    import invoice_cli
+    return invoice_cli.main(["--mode", "student", *(sys.argv[1:] if argv is None else argv)])
 
-    try:
-        # Read student data from Excel.
-        # If detailed reports are requested, enable detailed parsing so payment history is available.
-        students_fees = read_student_data(excel_file, detailed_report=generate_detailed)
-        
-        if not students_fees:
-            print("No student data found. Exiting.")
-        else:
-            if generate_detailed:
-                for student_name, fees_data in students_fees.items():
-                    generate_detailed_invoice(student_name, fees_data)
-                print(f"\n✅ Successfully generated {len(students_fees)} detailed reports!")
-            
-            if generate_combined:
-                combined_file = generate_combined_invoice(students_fees)
-                print(f"\n✅ Successfully generated combined invoice: {combined_file}")
-        
-    except FileNotFoundError:
-        print(f"Error: Excel file '{excel_file}' not found!")
-    except Exception as e:
-        print(f"Error: {str(e)}")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""Faculty payroll computed directly from the monthly attendance CSVs.
+
+Attendance_tracking/attendance_YYYY_MM.csv records one row per session (Day,
+Date, Time "HH:MM-HH:MM", Class, Subject, Faculty). This module turns those rows
+into the salary frame the faculty invoice generator expects (Faculty, Class,
+Hours, Total), pricing each session from a rate table:
+
+    Faculty,Class,Subject,Rate
+    ,,,500                          <- default hourly rate
+    ,10th CBSE,,600                 <- any faculty teaching 10th CBSE
+    Pravin K,,Mathematics,750       <- most specific matching rule wins
+
+Blank (or *) matches anything. A session matched by no rule is an error.
+"""
+import os
+import re
+import glob
+import numpy as np
+import pandas as pd
+from faculty_salary_generation_invoice import read_salary_data
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+ATTENDANCE_DIR = os.path.join(MODULE_DIR, os.pardir, "Attendance_tracking")
+RATES_FILE = os.path.join(MODULE_DIR, "payroll_rates.csv")
+
+RATE_KEYS = ('Faculty', 'Class', 'Subject')
+SLOT_PATTERN = r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$'
+
+def attendance_files(months=None, attendance_dir=ATTENDANCE_DIR):
+    """Monthly attendance CSVs in attendance_dir, oldest first.
+    months: optional iterable of 'YYYY-MM' strings to restrict to."""
+    files = sorted(glob.glob(os.path.join(attendance_dir, "attendance_[0-9][0-9][0-9][0-9]_[0-9][0-9].csv")))
+    if months is None:
+        return files
+    wanted = {month.replace('-', '_') for month in months}
+    return [path for path in files if re.search(r'attendance_(\d{4}_\d{2})\.csv$', path).group(1) in wanted]
+
+def read_attendance(files):
+    """Concatenate attendance CSVs into one frame with Date parsed (dd-mm-yyyy)"""
+    frames = [pd.read_csv(path, dtype=str) for path in files]
+    if not frames:
+        raise ValueError("No attendance files to read")
+    attendance = pd.concat(frames, ignore_index=True)
+    attendance['Date'] = pd.to_datetime(attendance['Date'], format="%d-%m-%Y")
+    return attendance
+
+def parse_time_slots(slots):
+    """Vectorised parse of 'HH:MM-HH:MM' slots into (start, end) minutes since midnight.
+    As in the attendance app, an end at or before the start is on the next day.
+    Unparseable slots give NaN."""
+    parts = slots.astype(str).str.extract(SLOT_PATTERN).astype(float)
+    start = parts[0] * 60 + parts[1]
+    end = parts[2] * 60 + parts[3]
+    end = end.where(end > start, end + 24 * 60)
+    return start, end
+
+def load_rates(rates_file=RATES_FILE):
+    """Read the rate table; blank or '*' in Faculty/Class/Subject matches anything"""
+    if not os.path.exists(rates_file):
+        raise FileNotFoundError(
+            f"Rate table '{rates_file}' not found; copy payroll_rates.example.csv to it and fill in the hourly rates"
+        )
+    rates = pd.read_csv(rates_file, dtype={key: str for key in RATE_KEYS})
+    for key in RATE_KEYS:
+        rates[key] = rates[key].fillna('').str.strip().replace('*', '')
+    rates['Rate'] = pd.to_numeric(rates['Rate'], errors='raise')
+    return rates
+
+def apply_rates(attendance, rates):
+    """Hourly rate per session: the matching rule with the most specific fields
+    (ties go to the rule listed last). Returns a float Series aligned with attendance."""
+    specificity = sum((rates[key] != '').astype(int) for key in RATE_KEYS)
+    order = np.lexsort((np.arange(len(rates)), specificity.to_numpy()))[::-1]
+
+    rate = pd.Series(np.nan, index=attendance.index)
+    unpriced = pd.Series(True, index=attendance.index)
+    for i in order:
+        rule = rates.iloc[i]
+        match = unpriced.copy()
+        for key in RATE_KEYS:
+            if rule[key]:
+                match &= attendance[key] == rule[key]
+        rate[match] = rule['Rate']
+        unpriced &= ~match
+        if not unpriced.any():
+            break
+    return rate
+
+def compute_payroll(attendance, rates):
+    """Salary frame (attendance columns plus Hours, Rate, Total) for the invoice generators"""
+    start, end = parse_time_slots(attendance['Time'])
+    bad_slots = start.isna()
+    if bad_slots.any():
+        raise ValueError(f"Unreadable time slots: {sorted(attendance.loc[bad_slots, 'Time'].astype(str).unique())}")
+
+    salary = attendance.copy()
+    for key in RATE_KEYS:
+        salary[key] = salary[key].astype(str).str.strip()
+    salary['Hours'] = (end - start) / 60
+    salary['Rate'] = apply_rates(salary, rates)
+    missing = salary['Rate'].isna()
+    if missing.any():
+        combos = salary.loc[missing, list(RATE_KEYS)].drop_duplicates().itertuples(index=False, name=None)
+        raise ValueError(f"No rate for (Faculty, Class, Subject): {sorted(combos)}")
+    salary['Total'] = salary['Hours'] * salary['Rate']
+    return salary
+
+def split_by_month(salary):
+    """Yield (df, month name, year) per calendar month, oldest first"""
+    for period, month_rows in salary.groupby(salary['Date'].dt.to_period('M'), sort=True):
+        yield month_rows, period.strftime("%B"), period.year
+
+def payroll_months(files, rates_file=RATES_FILE):
+    """Read attendance CSVs, price every session and split the result by month"""
+    return list(split_by_month(compute_payroll(read_attendance(files), load_rates(rates_file))))
+
+def read_salary_months(csv_file, rates_file=RATES_FILE):
+    """[(df, month name, year)] for one CSV: a prepared salary CSV (with Hours and
+    Total) is used as is, an attendance CSV is priced from the rate table."""
+    columns = pd.read_csv(csv_file, nrows=0).columns
+    if 'Hours' in columns and 'Total' in columns:
+        return [read_salary_data(csv_file)]
+    return payroll_months([csv_file], rates_file)
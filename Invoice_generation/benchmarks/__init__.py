@@ -0,0 +1 @@
+"""Synthetic-data benchmarks for the invoice pipeline; run with `python -m benchmarks`."""
@@ -0,0 +1,210 @@
+"""Time every stage of the invoice pipeline on synthetic inputs of increasing size.
+
+    cd Invoice_generation
+    python -m benchmarks --students 100 1000 10000 --sessions 1000 10000 --workers 4
+
+Every case runs in a fresh process, so its peak memory is its own. Results go to
+benchmarks/results/bench_<timestamp>.json (or --out) and a summary is printed.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import multiprocessing
+from contextlib import contextmanager
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import reportlab
+import Fee_completion_invoice as student_invoices
+import faculty_salary_generation_invoice as faculty_invoices
+from invoice_output import stream_zip
+from benchmarks.synthetic import make_fee_workbook, make_salary_csv
+
+try:
+    import resource
+except ImportError:  # Windows: no getrusage, peak RSS is not reported
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, in MB (None where unsupported)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return round(peak / (2 ** 20 if sys.platform == 'darwin' else 2 ** 10), 1)
+
+class StageRecorder:
+    """Seconds and peak memory per stage of one benchmark case.
+
+    peak_rss_mb is the process high-water mark at the end of the stage (it only
+    grows, so the stage that raised it is the one that needed it). With
+    trace_memory, peak Python allocations within each stage are recorded as well;
+    tracemalloc slows rendering several times over, so timings from such runs are
+    not comparable with untraced ones.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = {}
+        if trace_memory:
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        yield
+        record = {'seconds': round(time.perf_counter() - start, 4), 'peak_rss_mb': peak_rss_mb()}
+        if self.trace_memory:
+            record['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+        self.stages[name] = record
+
+def bench_students(students, sheets, payments, workers, trace_memory):
+    """Fee workbook -> aggregation -> detailed PDFs -> ZIP, plus the combined and merged reports.
+    The 'streamed' stage runs the detailed ZIP and combined report from iter_student_fees in one pass."""
+    sheets = max(1, min(sheets, students))
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        workbook_file = make_fee_workbook(os.path.join(workdir, 'fees.xlsx'), sheets, students // sheets, payments)
+        setup_seconds = time.perf_counter() - start
+
+        recorder = StageRecorder(trace_memory)
+        # First, so its peak RSS is not raised by the stages that hold the whole workbook
+        with recorder.stage('streamed'):
+            report = student_invoices.CombinedReport()
+            streamed = report.collect(student_invoices.iter_student_fees(workbook_file, detailed_report=True))
+            stream_zip(student_invoices.render_detailed_invoices(streamed, workers=workers), io.BytesIO())
+            report.render()
+        with recorder.stage('workbook_load'):
+            workbook = student_invoices.read_workbook(workbook_file)
+        with recorder.stage('aggregation'):
+            students_fees = student_invoices.summarize_student_fees(workbook, detailed_report=True)
+        with recorder.stage('render_detailed'):
+            pdfs = list(student_invoices.render_detailed_invoices(students_fees, workers=workers))
+        with recorder.stage('zip'):
+            zip_buffer = io.BytesIO()
+            stream_zip(pdfs, zip_buffer)
+        with recorder.stage('render_combined'):
+            combined = student_invoices.render_combined_invoice(students_fees)
+        with recorder.stage('render_merged'):
+            merged = student_invoices.render_merged_detailed_invoices(students_fees)
+
+    return {
+        'case': 'students',
+        'students': len(students_fees),
+        'sheets': sheets,
+        'payments_per_student': payments,
+        'workers': workers,
+        'setup_seconds': round(setup_seconds, 4),
+        'pdf_bytes': sum(len(pdf_bytes) for _, pdf_bytes in pdfs),
+        'zip_bytes': zip_buffer.getbuffer().nbytes,
+        'combined_bytes': len(combined),
+        'merged_bytes': len(merged),
+        'stages': recorder.stages,
+    }
+
+def bench_faculty(sessions, faculty, trace_memory):
+    """Salary CSV -> aggregation -> faculty PDFs -> ZIP, plus the combined report"""
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        csv_file = make_salary_csv(os.path.join(workdir, 'salary.csv'), faculty=faculty, sessions=sessions)
+        setup_seconds = time.perf_counter() - start
+
+        recorder = StageRecorder(trace_memory)
+        with recorder.stage('csv_load'):
+            df, month, year = faculty_invoices.read_salary_data(csv_file)
+        with recorder.stage('aggregation'):
+            salary_summary = faculty_invoices.summarize_salary(df)
+        with recorder.stage('render_individual'):
+            pdfs = [(faculty_invoices.faculty_invoice_filename(name),
+                     faculty_invoices.render_faculty_invoice(salary_summary, name, month, year))
+                    for name in salary_summary['by_faculty']]
+        with recorder.stage('render_canvas'):
+            for name in salary_summary['by_faculty']:
+                faculty_invoices.render_faculty_invoice(salary_summary, name, month, year, fast=True)
+        with recorder.stage('zip'):
+            zip_buffer = io.BytesIO()
+            stream_zip(pdfs, zip_buffer)
+        with recorder.stage('render_combined'):
+            combined = faculty_invoices.render_combined_invoice(salary_summary, month, year)
+
+    return {
+        'case': 'faculty',
+        'sessions': sessions,
+        'faculty': len(salary_summary['by_faculty']),
+        'setup_seconds': round(setup_seconds, 4),
+        'pdf_bytes': sum(len(pdf_bytes) for _, pdf_bytes in pdfs),
+        'zip_bytes': zip_buffer.getbuffer().nbytes,
+        'combined_bytes': len(combined),
+        'stages': recorder.stages,
+    }
+
+def run_isolated(function, *args):
+    """Run one benchmark case in a fresh process, so peak memory is not inherited"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(function, *args).result()
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'reportlab': reportlab.Version,
+        'excel_engine': student_invoices.EXCEL_ENGINE or 'default',
+    }
+
+def print_summary(results):
+    for result in results:
+        size = f"{result['students']} students" if result['case'] == 'students' else f"{result['sessions']} sessions"
+        print(f"{result['case']}: {size}")
+        for name, stage in result['stages'].items():
+            memory = f"{stage['peak_rss_mb']:>8} MB" if stage['peak_rss_mb'] is not None else ''
+            print(f"  {name:<20}{stage['seconds']:>10.3f} s{memory}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the invoice pipeline on synthetic data")
+    parser.add_argument('--students', type=int, nargs='*', default=[100, 1000, 10000],
+                        help="total students per fee workbook case (default: 100 1000 10000)")
+    parser.add_argument('--sheets', type=int, default=10, help="class sheets per workbook (default: 10)")
+    parser.add_argument('--payments', type=int, default=3, help="payment rows per student (default: 3)")
+    parser.add_argument('--sessions', type=int, nargs='*', default=[1000, 10000],
+                        help="attendance rows per salary CSV case (default: 1000 10000)")
+    parser.add_argument('--faculty', type=int, default=30, help="faculty members in salary CSVs (default: 30)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for detailed invoices (default: CPU count)")
+    parser.add_argument('--trace-memory', action='store_true', help="also record peak Python allocations per stage (slow)")
+    parser.add_argument('--out', default=None, help="results JSON path")
+    args = parser.parse_args(argv)
+
+    results = []
+    for students in args.students:
+        print(f"Benchmarking {students} students...")
+        results.append(run_isolated(bench_students, students, args.sheets, args.payments, args.workers, args.trace_memory))
+    for sessions in args.sessions:
+        print(f"Benchmarking {sessions} attendance sessions...")
+        results.append(run_isolated(bench_faculty, sessions, args.faculty, args.trace_memory))
+
+    out_file = args.out
+    if out_file is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        out_file = os.path.join(RESULTS_DIR, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(out_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'environment': environment(),
+            'trace_memory': args.trace_memory,
+            'results': results,
+        }, f, indent=2)
+
+    print_summary(results)
+    print(f"Results written to: {out_file}")
+    return 0
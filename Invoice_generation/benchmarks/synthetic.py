@@ -0,0 +1,68 @@
+"""Synthetic inputs shaped like the real fee workbook and attendance/salary CSV."""
+import numpy as np
+import pandas as pd
+
+FIRST_NAMES = ['Aarav', 'Aditi', 'Arjun', 'Diya', 'Ishaan', 'Kavya', 'Neha', 'Omkar', 'Pooja', 'Rohan', 'Sakshi', 'Tanvi']
+LAST_NAMES = ['Patil', 'Kulkarni', 'Deshmukh', 'Jadhav', 'Shinde', 'Pawar', 'Joshi', 'Kale', 'More', 'Gaikwad']
+SUBJECTS = ['Mathematics', 'Science', 'English', 'Social Studies']
+SLOTS = ['06:00-07:00', '07:00-08:30', '15:00-16:00', '16:00-18:00', '20:00-22:00']
+
+def student_names(count, rng):
+    """count distinct, realistic-looking student names"""
+    first = rng.choice(FIRST_NAMES, count)
+    last = rng.choice(LAST_NAMES, count)
+    return [f"{f} {l} {i:05d}" for i, (f, l) in enumerate(zip(first, last))]
+
+def fee_sheet(names, payments, rng, start=pd.Timestamp("2025-06-01")):
+    """One class sheet: a row per payment, the student name and Fee only on each
+    student's first row (the rest are blank, as in the office workbook)."""
+    n = len(names)
+    fees = rng.choice([12000, 15000, 18000, 24000], n).astype(float)
+    # Split each student's paid amount over `payments` instalments
+    paid = np.round(fees[:, None] * rng.uniform(0.05, 0.3, (n, payments)), -2)
+    remaining = np.clip(fees[:, None] - np.cumsum(paid, axis=1), 0, None)
+    dates = start + pd.to_timedelta(np.sort(rng.integers(0, 300, (n, payments)), axis=1).ravel(), unit="D")
+
+    first_row = np.zeros((n, payments), dtype=bool)
+    first_row[:, 0] = True
+    return pd.DataFrame({
+        'Student': np.where(first_row, np.repeat(names, payments).reshape(n, payments), None).ravel(),
+        'Date': dates,
+        'Fee': np.where(first_row, fees[:, None], np.nan).ravel(),
+        'Paid': paid.ravel(),
+        'Remaining': remaining.ravel(),
+    })
+
+def make_fee_workbook(path, sheets=10, students_per_sheet=100, payments=3, seed=0):
+    """Write a fee workbook with `sheets` class sheets x `students_per_sheet` students
+    x `payments` payment rows each. Returns the path."""
+    rng = np.random.default_rng(seed)
+    names = student_names(sheets * students_per_sheet, rng)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet in range(sheets):
+            sheet_names = names[sheet * students_per_sheet:(sheet + 1) * students_per_sheet]
+            fee_sheet(sheet_names, payments, rng).to_excel(writer, sheet_name=f"Class {sheet + 1}", index=False)
+    return path
+
+def make_salary_csv(path, faculty=20, classes=12, sessions=2000, rate=500.0, seed=0,
+                    start=pd.Timestamp("2025-11-01")):
+    """Write an attendance/salary CSV (the attendance columns plus Hours and Total)
+    with `sessions` rows spread over one month. Returns the path."""
+    rng = np.random.default_rng(seed)
+    dates = start + pd.to_timedelta(rng.integers(0, 28, sessions), unit="D")
+    slots = rng.choice(SLOTS, sessions)
+    starts = pd.to_datetime(pd.Series(slots).str[:5], format="%H:%M")
+    ends = pd.to_datetime(pd.Series(slots).str[6:], format="%H:%M")
+    hours = ((ends - starts).dt.total_seconds() / 3600).to_numpy()
+    df = pd.DataFrame({
+        'Day': dates.day_name(),
+        'Date': dates.strftime("%d-%m-%Y"),
+        'Time': slots,
+        'Class': [f"Class {c}" for c in rng.integers(1, classes + 1, sessions)],
+        'Subject': rng.choice(SUBJECTS, sessions),
+        'Faculty': [f"Faculty {f:03d}" for f in rng.integers(1, faculty + 1, sessions)],
+        'Hours': hours,
+        'Total': hours * rate,
+    })
+    df.to_csv(path, index=False)
+    return path
@@ -1,239 +1,239 @@
 import pandas as pd
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+from reportlab.platypus import Spacer
 from datetime import datetime
 import os
+import sys
+from invoice_output import write_pdf, content_hash, render_incremental
+from invoice_renderer import InvoiceRenderer, Bookmark
+from invoice_canvas import CanvasInvoiceRenderer
+
+# Styles, table styles and header/footer are built once and shared by every invoice
+RENDERER = InvoiceRenderer(title_leading=20)
+CANVAS_RENDERER = CanvasInvoiceRenderer(title_leading=20)
+
+def faculty_output_dir(current_month, current_year):
+    return os.path.join("faculty_invoices", str(current_year), str(current_month))
+
+def faculty_invoice_filename(faculty_name):
+    return f"Adhyay_Academy_{faculty_name.replace(' ', '_')}_Salary_{datetime.today().strftime('%Y%m%d')}.pdf"
+
+def merged_invoice_filename():
+    return f"Adhyay_Academy_All_Faculty_Salary_{datetime.today().strftime('%Y%m%d')}.pdf"
+
+def combined_invoice_filename():
+    return f"Adhyay_Academy_Combined_Salary_{datetime.today().strftime('%Y%m%d')}.pdf"
+
+def read_salary_data(csv_file):
+    """Read an attendance/salary CSV (Date as dd-mm-yyyy).
+    Returns (df, month name, year) with the month taken from the first row."""
+    df = pd.read_csv(csv_file)
+    df['Date'] = pd.to_datetime(df['Date'], format="%d-%m-%Y")
+    first_date = df['Date'].iloc[0]
+    return df, first_date.strftime("%B"), first_date.year
+
+def summarize_salary(df):
+    """Aggregate Hours and Total per faculty and class in a single groupby pass.
+
+    The result is shared by the individual and combined invoices:
+        'classes': one row per (Faculty, Class), sorted by faculty then class
+        'by_faculty': {faculty: that faculty's rows of 'classes'}
+        'faculty_totals': Hours/Total subtotal per faculty (indexed by Faculty)
+        'grand_total': {'Hours': ..., 'Total': ...}
+    """
+    classes = df.groupby(['Faculty', 'Class'], sort=True)[['Hours', 'Total']].sum().reset_index()
+    # Subtotals come from the small per-class table, not another pass over df
+    faculty_totals = classes.groupby('Faculty', sort=True)[['Hours', 'Total']].sum()
+    return {
+        'classes': classes,
+        'by_faculty': {faculty: rows for faculty, rows in classes.groupby('Faculty', sort=True)},
+        'faculty_totals': faculty_totals,
+        'grand_total': {'Hours': faculty_totals['Hours'].sum(), 'Total': faculty_totals['Total'].sum()},
+    }
+
+def _as_salary_summary(data):
+    # Accept raw attendance/salary rows as well as a precomputed summary
+    return summarize_salary(data) if isinstance(data, pd.DataFrame) else data
+
+def format_hours(hours):
+    # Whole hours print without decimals; sessions priced from time slots can be fractional
+    return f"{round(float(hours), 2):g}"
+
+def faculty_invoice_rows(salary_summary, faculty_name):
+    """Table rows (header, one per class, grand total) for a faculty member's invoice"""
+    class_rows = salary_summary['by_faculty'][faculty_name]
+    totals = salary_summary['faculty_totals']
 
-def generate_faculty_invoice(faculty_data, faculty_name, current_month, current_year):
-    """Generate invoice for a specific faculty member"""
-    
-    # Create output directory
-    output_dir = f"faculty_invoices\\{current_year}\\{current_month}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create PDF document
-    invoice_file = os.path.join(output_dir, f"Adhyay_Academy_{faculty_name.replace(' ', '_')}_Salary_{datetime.today().strftime('%Y%m%d')}.pdf")
-    doc = SimpleDocTemplate(invoice_file, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title Style
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=16,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.HexColor("#2E4053"),
-        leading=20,
-    )
-
-    # Header
-    elements.append(Paragraph("<b>Adhyay Academy</b>", title_style))
-    elements.append(Paragraph("<b>Faculty Salary Invoice</b>", title_style))
-    
-    elements.append(Spacer(1, 20))
-
+    data = [["Class", "Hours", "Amount (Rs.)"]]
+    for class_name, hours, amount in zip(class_rows['Class'], class_rows['Hours'], class_rows['Total']):
+        data.append([class_name, format_hours(hours), f"{amount:,.2f}"])
+    data.append(["Grand Total", format_hours(totals.at[faculty_name, 'Hours']), f"{totals.at[faculty_name, 'Total']:,.2f}"])
+    return data
+
+COMBINED_HEADER = ["Faculty Name", "Class", "Hours", "Amount (Rs.)"]
+COMBINED_COL_WIDTHS = [150, 150, 100, 150]
+
+def combined_invoice_sections(salary_summary):
+    """Yield (faculty, class rows generator, subtotal row) per faculty for the combined report"""
+    totals = salary_summary['faculty_totals']
+    for faculty, class_rows in salary_summary['by_faculty'].items():
+        def rows(faculty=faculty, class_rows=class_rows):
+            # Show faculty name only once
+            for i, (class_name, hours, amount) in enumerate(zip(class_rows['Class'], class_rows['Hours'], class_rows['Total'])):
+                yield [faculty if i == 0 else "", class_name, format_hours(hours), f"{amount:,.2f}"]
+        subtotal = ["Subtotal", "", format_hours(totals.at[faculty, 'Hours']), f"{totals.at[faculty, 'Total']:,.2f}"]
+        yield faculty, rows(), subtotal
+
+def combined_grand_total_row(salary_summary):
+    grand_total = salary_summary['grand_total']
+    return ["Grand Total", "", format_hours(grand_total['Hours']), f"{grand_total['Total']:,.2f}"]
+
+FACULTY_TITLE = "Faculty Salary Invoice"
+FACULTY_NOTE = "This is a system-generated salary invoice from Adhyay Academy."
+
+def faculty_invoice_info(faculty_name, current_month, current_year):
+    """(label, value) info lines of a faculty member's invoice"""
+    return [
+        ("Faculty Name", faculty_name),
+        ("Month", f"{current_month} {current_year}"),
+        ("Invoice Date", datetime.today().strftime("%d-%m-%Y")),
+    ]
+
+def faculty_invoice_body(salary_summary, faculty_name, current_month, current_year):
+    """Flowables between the header and footer of a faculty member's invoice"""
     # Faculty Info
-    date_today = datetime.today().strftime("%d-%m-%Y")
-    info_style = styles["Normal"]
-    elements.append(Paragraph(f"<b>Faculty Name:</b> {faculty_name}", info_style))
-    elements.append(Paragraph(f"<b>Month:</b> {current_month} {current_year}", info_style))
-    
-    elements.append(Paragraph(f"<b>Invoice Date:</b> {date_today}", info_style))
-    
+    elements = [RENDERER.info(label, value) for label, value in faculty_invoice_info(faculty_name, current_month, current_year)]
     elements.append(Spacer(1, 15))
 
-    # Create table data
-    data = [["Class", "Hours", "Amount (Rs.)"]]
-    total_hours = 0
-    total_amount = 0
-    
-    # Group by class and sum hours and total
-    class_summary = faculty_data.groupby('Class').agg({
-        'Hours': 'sum',
-        'Total': 'sum'
-    }).reset_index()
-    
-    for _, row in class_summary.iterrows():
-        data.append([
-            row['Class'],
-            f"{int(row['Hours'])}",
-            f"{row['Total']:,.2f}"
-        ])
-        total_hours += row['Hours']
-        total_amount += row['Total']
-
-    # Add total row
-    data.append(["Grand Total", f"{total_hours}", f"{total_amount:,.2f}"])
-
-    # Create and style table
-    table = Table(data, colWidths=[200, 100, 150])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#34495E")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-        ("BACKGROUND", (0, 1), (-1, -2), colors.HexColor("#F8F9F9")),
-        ("BACKGROUND", (0, -1), (-1, -1), colors.HexColor("#EAECEE")),
-        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-    ]))
-    elements.append(table)
-
-    # Footer
-    elements.append(Spacer(1, 20))
-    elements.append(Paragraph(
-        "<b>Note:</b> This is a system-generated salary invoice from Adhyay Academy.",
-        styles["Italic"]
-    ))
-
-    # Build PDF
-    doc.build(elements)
+    # Create table data from the shared per-class aggregate
+    data = faculty_invoice_rows(salary_summary, faculty_name)
+    elements.append(RENDERER.table(data, [200, 100, 150], 'faculty'))
+    return elements
+
+def render_faculty_invoice(faculty_data, faculty_name, current_month, current_year, fast=False):
+    """Render the salary invoice for a faculty member in memory and return the PDF bytes.
+    faculty_data is the summarize_salary() result (or raw rows for this faculty).
+    fast draws the invoice straight on a canvas instead of through platypus; invoices
+    with too many classes for one page are laid out by platypus regardless."""
+    salary_summary = _as_salary_summary(faculty_data)
+    if fast:
+        info = faculty_invoice_info(faculty_name, current_month, current_year)
+        data = faculty_invoice_rows(salary_summary, faculty_name)
+        if CANVAS_RENDERER.fits(len(info), 15, len(data), 'faculty', 20):
+            return CANVAS_RENDERER.render(FACULTY_TITLE, info, 15, data, [200, 100, 150], 'faculty', FACULTY_NOTE, note_space=20)
+    body = faculty_invoice_body(salary_summary, faculty_name, current_month, current_year)
+    return RENDERER.render(FACULTY_TITLE, body, FACULTY_NOTE, note_space=20)
+
+def generate_faculty_invoice(faculty_data, faculty_name, current_month, current_year, output_dir=None, fast=False):
+    """Generate invoice for a specific faculty member"""
+    invoice_file = write_pdf(
+        render_faculty_invoice(faculty_data, faculty_name, current_month, current_year, fast),
+        output_dir or faculty_output_dir(current_month, current_year),
+        faculty_invoice_filename(faculty_name)
+    )
     print(f"Generated invoice for {faculty_name}: {invoice_file}")
     return invoice_file
 
-def generate_combined_invoice(df, current_month, current_year):
-    """Generate a combined invoice for all faculty members"""
-    
-    # Create output directory
-    output_dir = f"faculty_invoices\\{current_year}\\{current_month}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Create PDF document
-    invoice_file = os.path.join(output_dir, f"Adhyay_Academy_Combined_Salary_{datetime.today().strftime('%Y%m%d')}.pdf")
-    doc = SimpleDocTemplate(invoice_file, pagesize=A4)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # Title Style
-    title_style = ParagraphStyle(
-        name="TitleStyle",
-        fontSize=16,
-        alignment=1,
-        spaceAfter=20,
-        textColor=colors.HexColor("#2E4053"),
-        leading=20,
+def faculty_invoice_hash(faculty_name, invoice_rows, current_month, current_year):
+    """Content hash of everything printed on a faculty member's invoice, the Invoice Date (also
+    in the file name) included, so a PDF kept on disk is only reused on the day it was rendered"""
+    return content_hash("faculty", faculty_name, invoice_rows, current_month, current_year,
+                        datetime.today().strftime("%d-%m-%Y"))
+
+def render_faculty_invoices_incremental(salary_summary, current_month, current_year, output_dir=None, faculty_names=None,
+                                        fast=False):
+    """Yield (file name, PDF bytes) for every faculty member (or just faculty_names), rendering
+    only those whose invoice rows changed since the last run into output_dir (default: the
+    month's folder). Unchanged invoices are read back from disk, as recorded in the invoice manifest."""
+    salary_summary = _as_salary_summary(salary_summary)
+    output_dir = output_dir or faculty_output_dir(current_month, current_year)
+    faculty_names = salary_summary['by_faculty'] if faculty_names is None else faculty_names
+    faculty_rows = {faculty: faculty_invoice_rows(salary_summary, faculty) for faculty in faculty_names}
+
+    def render_batch(changed):
+        for faculty, _ in changed:
+            yield faculty_invoice_filename(faculty), render_faculty_invoice(salary_summary, faculty, current_month, current_year, fast)
+
+    return render_incremental(
+        faculty_rows, output_dir,
+        lambda faculty, rows: faculty_invoice_hash(faculty, rows, current_month, current_year),
+        render_batch
+    )
+
+def generate_faculty_invoices(salary_summary, current_month, current_year, incremental=True, output_dir=None, fast=False):
+    """Generate invoices for every faculty member; with incremental=True, unchanged ones are kept.
+    Returns the file paths."""
+    output_dir = output_dir or faculty_output_dir(current_month, current_year)
+    if not incremental:
+        return [generate_faculty_invoice(salary_summary, faculty, current_month, current_year, output_dir, fast)
+                for faculty in _as_salary_summary(salary_summary)['by_faculty']]
+    paths = [os.path.join(output_dir, filename)
+             for filename, _ in render_faculty_invoices_incremental(salary_summary, current_month, current_year, output_dir, fast=fast)]
+    print(f"Generated {len(paths)} faculty invoices in {output_dir}")
+    return paths
+
+def render_merged_faculty_invoices(salary_summary, current_month, current_year):
+    """Render every faculty member's invoice into one PDF (a new page and a bookmark each)
+    and return the bytes"""
+    salary_summary = _as_salary_summary(salary_summary)
+    documents = []
+    for index, faculty in enumerate(salary_summary['by_faculty']):
+        body = faculty_invoice_body(salary_summary, faculty, current_month, current_year)
+        documents.append([Bookmark(f"faculty-{index}", str(faculty))] + RENDERER.document(FACULTY_TITLE, body, FACULTY_NOTE, note_space=20, as_form=True))
+    return RENDERER.render_merged(documents)
+
+def generate_merged_faculty_invoices(salary_summary, current_month, current_year, output_dir=None):
+    """Generate one PDF holding every faculty member's invoice, for printing"""
+    invoice_file = write_pdf(
+        render_merged_faculty_invoices(salary_summary, current_month, current_year),
+        output_dir or faculty_output_dir(current_month, current_year),
+        merged_invoice_filename()
     )
+    print(f"Generated merged faculty invoices: {invoice_file}")
+    return invoice_file
 
-    # Header
-    elements.append(Paragraph("<b>Adhyay Academy</b>", title_style))
-    elements.append(Paragraph("<b>Combined Faculty Salary Report</b>", title_style))
-    elements.append(Spacer(1, 20))
+def render_combined_invoice(df, current_month, current_year):
+    """Render the combined invoice for all faculty members in memory and return the PDF bytes.
+    df is the summarize_salary() result (or the raw salary rows)."""
+    salary_summary = _as_salary_summary(df)
 
     # Report Info
     date_today = datetime.today().strftime("%d-%m-%Y")
-    info_style = styles["Normal"]
-    elements.append(Paragraph(f"<b>Month:</b> {current_month} {current_year}", info_style))
-    elements.append(Paragraph(f"<b>Date:</b> {date_today}", info_style))
-    elements.append(Spacer(1, 15))
+    elements = [
+        RENDERER.info("Month", f"{current_month} {current_year}"),
+        RENDERER.info("Date", date_today),
+        Spacer(1, 15),
+    ]
+
+    # One section per faculty from the shared per-class aggregate, laid out as
+    # bounded LongTables (header repeated on every page) closed by the subtotal
+    for _, rows, subtotal in combined_invoice_sections(salary_summary):
+        elements.extend(RENDERER.long_tables(
+            COMBINED_HEADER, rows, COMBINED_COL_WIDTHS, 'faculty_combined_rows',
+            total_row=subtotal, total_style='faculty_combined'
+        ))
+        elements.append(Spacer(1, 12))
+    elements.append(RENDERER.table([combined_grand_total_row(salary_summary)], COMBINED_COL_WIDTHS, 'faculty_combined_total'))
+
+    return RENDERER.render(
+        "Combined Faculty Salary Report", elements,
+        "This is a system-generated combined salary report from Adhyay Academy.",
+        note_space=20
+    )
 
-    # Create table data
-    data = [["Faculty Name", "Class", "Hours", "Amount (Rs.)"]]
-    grand_total_hours = 0
-    grand_total_amount = 0
-
-    # Process each faculty's data
-    for faculty in sorted(df['Faculty'].unique()):
-        faculty_data = df[df['Faculty'] == faculty]
-        
-        # Group by class and sum hours and total
-        class_summary = faculty_data.groupby('Class').agg({
-            'Hours': 'sum',
-            'Total': 'sum'
-        }).reset_index()
-        
-        faculty_total_hours = 0
-        faculty_total_amount = 0
-        
-        # Add faculty's class-wise details
-        for _, row in class_summary.iterrows():
-            data.append([
-                faculty if faculty_total_hours == 0 else "",  # Show faculty name only once
-                row['Class'],
-                f"{int(row['Hours'])}",
-                f"{row['Total']:,.2f}"
-            ])
-            faculty_total_hours += row['Hours']
-            faculty_total_amount += row['Total']
-            
-        # Add faculty subtotal
-        data.append([
-            "Subtotal",
-            "",
-            f"{faculty_total_hours}",
-            f"{faculty_total_amount:,.2f}"
-        ])
-        data.append(["", "", "", ""])  # Empty row for spacing
-        
-        grand_total_hours += faculty_total_hours
-        grand_total_amount += faculty_total_amount
-
-    # Add grand total row
-    data.append([
-        "Grand Total",
-        "",
-        f"{grand_total_hours}",
-        f"{grand_total_amount:,.2f}"
-    ])
-
-    # Create and style table
-    table = Table(data, colWidths=[150, 150, 100, 150])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#34495E")),
-        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-        ("ALIGN", (2, 0), (-1, -1), "CENTER"),  # Center align numbers
-        ("ALIGN", (0, 0), (1, -1), "LEFT"),     # Left align text
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
-        ("BACKGROUND", (0, -1), (-1, -1), colors.HexColor("#EAECEE")),
-        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
-        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
-    ]))
-    elements.append(table)
-
-    # Footer
-    elements.append(Spacer(1, 20))
-    elements.append(Paragraph(
-        "<b>Note:</b> This is a system-generated combined salary report from Adhyay Academy.",
-        styles["Italic"]
-    ))
-
-    # Build PDF
-    doc.build(elements)
+def generate_combined_invoice(df, current_month, current_year, output_dir=None):
+    """Generate a combined invoice for all faculty members"""
+    invoice_file = write_pdf(
+        render_combined_invoice(df, current_month, current_year),
+        output_dir or faculty_output_dir(current_month, current_year),
+        combined_invoice_filename()
+    )
     print(f"Generated combined invoice: {invoice_file}")
     return invoice_file
 
-def main():
-    # Configuration
-    GENERATE_INDIVIDUAL = True  # Set to False to skip individual invoices
-    GENERATE_COMBINED = True    # Set to False to skip combined invoice
-    
-    try:
-        csv_file = "C:\\Users\\DELL\\Downloads\\AA Attendance - November.csv"
-        df = pd.read_csv(csv_file)
-        df['Date'] = pd.to_datetime(df['Date'], format="%d-%m-%Y")
-        
-        first_date = df['Date'].iloc[0]
-        current_month = first_date.strftime("%B")
-        current_year = first_date.year
-        
-        if GENERATE_INDIVIDUAL:
-            for faculty in df['Faculty'].unique():
-                faculty_data = df[df['Faculty'] == faculty]
-                generate_faculty_invoice(faculty_data, faculty, current_month, current_year)
-            print("\n✅ Individual invoices generated successfully!")
-            
-        if GENERATE_COMBINED:
-            generate_combined_invoice(df, current_month, current_year)
-            print("\n✅ Combined invoice generated successfully!")
-        
-    except FileNotFoundError:
-        print(f"Error: CSV file '{csv_file}' not found!")
-    except Exception as e:
-        print(f"Error: {str(e)}")
+def main(argv=None):
+    """Command-line entry point for faculty invoices; see invoice_cli for the options"""
+    import invoice_cli
+    return invoice_cli.main(["--mode", "faculty", *(sys.argv[1:] if argv is None else argv)])
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
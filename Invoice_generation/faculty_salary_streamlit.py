@@ -2,57 +2,172 @@ import streamlit as st
 import pandas as pd
 import os
 import io
-import zipfile
-import tempfile
+import hashlib
 from datetime import datetime
 
 # faculty generators
-from faculty_salary_generation_invoice import generate_faculty_invoice, generate_combined_invoice as faculty_combined
+from faculty_salary_generation_invoice import (
+    summarize_salary, render_faculty_invoice, faculty_invoice_filename, render_faculty_invoices_incremental,
+    faculty_invoice_rows, faculty_invoice_hash,
+    render_combined_invoice as faculty_combined, combined_invoice_filename as faculty_combined_filename
+)
 
 # student generators
-from Fee_completion_invoice import read_student_data, generate_combined_invoice as student_combined, generate_detailed_invoice as student_detailed
+from Fee_completion_invoice import (
+    iter_sheet_fees, CombinedReport, render_detailed_invoices as student_detailed_batch,
+    render_detailed_invoices_incremental as student_detailed_incremental, detailed_invoice_hash,
+    render_merged_detailed_invoices as student_merged, merged_invoice_filename as student_merged_filename,
+    render_combined_invoice as student_combined, combined_invoice_filename as student_combined_filename
+)
+from invoice_output import stream_zip, content_hash, PdfCache, render_cached
+from invoice_jobs import JobRunner
+from attendance_payroll import RATES_FILE, load_rates, compute_payroll, split_by_month
 
 st.set_page_config(page_title="Adhyay Academy — Invoice Generator", layout="centered")
 st.title("Adhyay Academy — Invoice Generator (Faculty / Student)")
 
+def upload_digest(uploaded):
+    return hashlib.sha256(uploaded.getvalue()).hexdigest()
+
+# Parsed uploads are cached by content hash: reruns with the same file (e.g. after
+# toggling a checkbox) skip parsing and aggregation entirely
+def rates_digest():
+    # Part of the parse cache key, so editing the rate table re-prices cached uploads
+    if not os.path.exists(RATES_FILE):
+        return None
+    with open(RATES_FILE, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+@st.cache_data(max_entries=8, show_spinner="Reading attendance data...")
+def parse_salary_upload(digest, rates_version, _data):
+    """[(salary summary, month name, year)] for an uploaded CSV, as invoice_cli reads it: a prepared
+    salary CSV is one month, a raw attendance export is priced and split by calendar month"""
+    df = pd.read_csv(io.BytesIO(_data))
+    df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce')
+    if 'Hours' in df.columns and 'Total' in df.columns:
+        first_date = df['Date'].dropna().iloc[0] if not df['Date'].dropna().empty else pd.Timestamp.now()
+        months = [(df, first_date.strftime("%B"), first_date.year)]
+    else:
+        # Raw attendance export: hours come from the time slots, amounts from the rate table
+        months = split_by_month(compute_payroll(df, load_rates()))
+    # Aggregate once; individual and combined invoices share the result
+    return [(summarize_salary(month_df), month, year) for month_df, month, year in months]
+
+@st.cache_resource
+def get_pdf_cache():
+    """Rendered PDFs shared by all sessions, keyed by the content hash of each invoice"""
+    return PdfCache()
+
+@st.cache_resource
+def get_job_runner():
+    """Background invoice batches shared by all sessions; they keep running across reruns"""
+    return JobRunner()
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes} min {seconds} s" if minutes else f"{seconds} s"
+
+@st.fragment(run_every=1.0)
+def show_job_progress(job):
+    """Progress bar and ETA of a running job, refreshed every second without rerunning the page"""
+    if job.status != "running":
+        # Full rerun, so the page swaps the progress bar for the result
+        st.rerun()
+    eta = job.eta_seconds()
+    text = f"{job.label}: {job.done} of {job.total} PDFs"
+    if eta is not None:
+        text += f" — about {format_seconds(eta)} left"
+    st.progress(job.progress, text=text)
+    if st.button("Cancel", key=f"cancel_{job.id}"):
+        job.cancel()
+
+def show_job(job_id):
+    """A background job's progress while it runs, its download (or error) when it ends"""
+    job = get_job_runner().get(job_id)
+    if job is None:
+        return
+
+    if job.status == "running":
+        show_job_progress(job)
+    elif job.status == "done":
+        st.download_button("Download all invoices (ZIP)", data=job.result, file_name=job.filename,
+                           mime="application/zip", key=f"download_{job.id}")
+        st.success(f"Generated {job.count} file(s) in {format_seconds(job.finished - job.started)}.")
+    elif job.status == "failed":
+        st.error(f"Error: {job.error}")
+    else:
+        st.warning("Generation was cancelled.")
+
+def dated(digest):
+    # Invoices print today's date, so cached PDFs are only reused on the same day
+    # (the per-invoice hashes already include it; this is for whole-upload documents)
+    return content_hash(digest, datetime.today().strftime("%Y%m%d"))
+
+def cached_document(cache, digest, render):
+    """(file name, PDF bytes) of a whole-upload document, rendered only on a cache miss"""
+    entry = cache.get(digest)
+    if entry is None:
+        entry = render()
+        cache.put(digest, *entry)
+    return entry
+
 mode = st.radio("Select mode", ("Faculty Salary", "Student Fees"))
 
 if mode == "Faculty Salary":
-    uploaded = st.file_uploader("Upload CSV (Date dd-mm-yyyy)", type="csv")
+    uploaded = st.file_uploader("Upload salary or attendance CSV (Date dd-mm-yyyy)", type="csv",
+                                help="Attendance CSVs without Hours/Total are priced from payroll_rates.csv")
     gen_ind = st.checkbox("Generate Individual Invoices", True)
     gen_comb = st.checkbox("Generate Combined Invoice", True)
+    reuse = st.checkbox("Reuse unchanged invoices from earlier runs", True,
+                        help="Only faculty whose hours changed since an earlier run today are rendered again")
 
     if st.button("Generate") and uploaded:
         try:
-            df = pd.read_csv(uploaded)
-            df['Date'] = pd.to_datetime(df['Date'], dayfirst=True, errors='coerce')
-            first_date = df['Date'].dropna().iloc[0] if not df['Date'].dropna().empty else pd.Timestamp.now()
-            month = first_date.strftime("%B")
-            year = first_date.year
-
-            out_paths = []
-            with tempfile.TemporaryDirectory() as tmpdir:
+            digest = upload_digest(uploaded)
+            rates_version = rates_digest()
+            salary_months = parse_salary_upload(digest, rates_version, uploaded.getvalue())
+            pdf_cache = get_pdf_cache()
+
+            def month_entries(salary_summary, month, year):
+                def render_faculty_batch(missing):
+                    if reuse:
+                        return render_faculty_invoices_incremental(salary_summary, month, year,
+                                                                   faculty_names=[faculty for faculty, _ in missing])
+                    return ((faculty_invoice_filename(faculty), render_faculty_invoice(salary_summary, faculty, month, year))
+                            for faculty, _ in missing)
+
                 if gen_ind:
-                    for faculty in df['Faculty'].unique():
-                        fac_df = df[df['Faculty'] == faculty]
-                        path = generate_faculty_invoice(fac_df, faculty, month, year)
-                        if os.path.exists(path):
-                            out_paths.append(path)
+                    faculty_rows = {faculty: faculty_invoice_rows(salary_summary, faculty) for faculty in salary_summary['by_faculty']}
+                    yield from render_cached(
+                        faculty_rows, pdf_cache,
+                        lambda faculty, rows: faculty_invoice_hash(faculty, rows, month, year),
+                        render_faculty_batch
+                    )
                 if gen_comb:
-                    path = faculty_combined(df, month, year)
-                    if os.path.exists(path):
-                        out_paths.append(path)
-
-                if not out_paths:
-                    st.warning("No files generated.")
-                else:
-                    zip_buffer = io.BytesIO()
-                    with zipfile.ZipFile(zip_buffer, "w") as zf:
-                        for p in out_paths:
-                            zf.write(p, arcname=os.path.basename(p))
-                    zip_buffer.seek(0)
-                    st.download_button("Download invoices ZIP", zip_buffer, file_name=f"invoices_faculty_{month}_{year}.zip")
-                    st.success(f"Generated {len(out_paths)} file(s).")
+                    # The rate table prices attendance uploads, so it is part of the key
+                    yield cached_document(
+                        pdf_cache, dated(content_hash("faculty_combined", digest, rates_version, month, year)),
+                        lambda: (faculty_combined_filename(), faculty_combined(salary_summary, month, year))
+                    )
+
+            # PDFs are rendered in memory (or taken from the cache) and written straight into the ZIP, one at a time;
+            # an upload spanning several months gets a folder per month
+            def faculty_entries():
+                for salary_summary, month, year in salary_months:
+                    for filename, pdf_bytes in month_entries(salary_summary, month, year):
+                        yield (f"{year}_{month}/{filename}" if len(salary_months) > 1 else filename), pdf_bytes
+
+            zip_buffer = io.BytesIO()
+            count = stream_zip(faculty_entries(), zip_buffer)
+
+            if not count:
+                st.warning("No files generated.")
+            else:
+                zip_buffer.seek(0)
+                periods = [f"{month}_{year}" for _, month, year in salary_months]
+                period = periods[0] if len(periods) == 1 else f"{periods[0]}_to_{periods[-1]}"
+                st.download_button("Download invoices ZIP", zip_buffer, file_name=f"invoices_faculty_{period}.zip")
+                st.success(f"Generated {count} file(s).")
 
         except Exception as e:
             st.error(f"Error: {e}")
@@ -63,55 +178,71 @@ else:  # Student Fees
     uploaded = st.file_uploader("Upload Excel (.xls/.xlsx) — all sheets will be processed", type=["xls", "xlsx"])
     gen_comb = st.checkbox("Generate combined admin report", value=True)
     gen_detailed = st.checkbox("Generate detailed invoices for each student", value=False)
+    merge_detailed = st.checkbox("Merge detailed invoices into one printable PDF", value=False, disabled=not gen_detailed,
+                                 help="One page per student, bookmarked by class and student")
+    reuse = st.checkbox("Reuse unchanged invoices from earlier runs", True, disabled=not gen_detailed,
+                        help="Only students whose fee records changed since an earlier run today are rendered again")
+    workers = st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1, value=os.cpu_count() or 1,
+                              help="Detailed invoices are rendered in parallel across this many processes")
 
     if st.button("Generate Student Invoices"):
 
         if not uploaded:
             st.warning("Please upload an Excel file first.")
         else:
-            tmp_path = None
             try:
-                # save uploaded to a temp file because read_student_data expects a path
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-                    tmp.write(uploaded.getbuffer())
-                    tmp_path = tmp.name
-
-                st.info("Reading student data...")
-                students_fees = read_student_data(tmp_path, detailed_report=gen_detailed)
-
-                if not students_fees:
-                    st.warning("No student records found in the uploaded file.")
-                else:
-                    out_paths = []
-
-                    if gen_detailed:
-                        st.info("Generating detailed student invoices...")
-                        for idx, (student_name, fees_data) in enumerate(students_fees.items(), 1):
-                            st.write(f"{idx}. {student_name} ({fees_data.get('class_name','')})")
-                            path = student_detailed(student_name, fees_data)
-                            if os.path.exists(path):
-                                out_paths.append(path)
-
+                data = uploaded.getvalue()
+                digest = upload_digest(uploaded)
+                pdf_cache = get_pdf_cache()
+
+                def render_student_batch(missing):
+                    if reuse:
+                        return student_detailed_incremental(missing, workers=workers)
+                    return student_detailed_batch(missing, workers=workers)
+
+                # Rendered on a background thread (or taken from the cache) and written straight into the ZIP, one at a time
+                # Students are read one sheet at a time; the combined report collects their totals on the way
+                def student_entries(job):
+                    report = CombinedReport()
+
+                    def read_students():
+                        # The workbook is parsed once, by the job; the progress total grows as each sheet is read
+                        for _, sheet_fees in iter_sheet_fees(io.BytesIO(data), detailed_report=gen_detailed):
+                            if gen_detailed and not merge_detailed:
+                                job.expect(len(sheet_fees))
+                            yield from sheet_fees.items()
+                        if not len(report):
+                            raise ValueError("No student records found in the uploaded file.")
+
+                    students = report.collect(read_students())
+                    if gen_detailed and merge_detailed:
+                        yield cached_document(
+                            pdf_cache, dated(content_hash("student_merged", digest)),
+                            lambda: (student_merged_filename(), student_merged(students))
+                        )
+                    elif gen_detailed:
+                        yield from render_cached(students, pdf_cache, detailed_invoice_hash, render_student_batch)
                     if gen_comb:
-                        st.info("Generating combined student report...")
-                        combined_path = student_combined(students_fees)
-                        if os.path.exists(combined_path):
-                            out_paths.append(combined_path)
-
-                    if out_paths:
-                        zip_buffer = io.BytesIO()
-                        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-                            for p in out_paths:
-                                zf.write(p, arcname=os.path.basename(p))
-                        zip_buffer.seek(0)
-                        fname = f"student_invoices_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
-                        st.download_button("Download all invoices (ZIP)", data=zip_buffer, file_name=fname, mime="application/zip")
-                        st.success(f"Generated {len(out_paths)} file(s).")
-                    else:
-                        st.warning("No PDF files were generated.")
+                        def render_combined():
+                            # Finish the pass if no detailed invoices consumed it (or they came from the cache)
+                            for _ in students:
+                                pass
+                            return student_combined_filename(), student_combined(report)
+
+                        yield cached_document(pdf_cache, dated(content_hash("student_combined", digest)), render_combined)
+
+                # One PDF each for the merged and combined documents; detailed invoices are added per sheet
+                total = (1 if gen_detailed and merge_detailed else 0) + (1 if gen_comb else 0)
+                if not (gen_detailed or gen_comb):
+                    st.warning("Nothing selected to generate.")
+                else:
+                    fname = f"student_invoices_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+                    job = get_job_runner().submit(uploaded.name, total, student_entries, fname)
+                    st.session_state['student_job'] = job.id
 
             except Exception as e:
                 st.error(f"Error: {e}")
-            finally:
-                if tmp_path and os.path.exists(tmp_path):
-                    os.remove(tmp_path)
\ No newline at end of file
+
+    # The job outlives reruns, so its progress (or download) stays on the page until the next batch
+    if 'student_job' in st.session_state:
+        show_job(st.session_state['student_job'])
@@ -0,0 +1,199 @@
+"""Persistent fee ledger: fee workbooks imported once into SQLite, then queried.
+
+    python fee_ledger.py import "AA Fee.xlsx" "AA Fee 2026.xlsx"
+    python fee_ledger.py history "Student Name"
+
+Tables: classes (one per workbook sheet), students (fee and remaining balance
+per student and class) and payments (one row per workbook row with a Paid
+amount, refunds and corrections included, in row order), indexed by student
+and by date.
+
+Importing is an idempotent upsert: students are matched on (class, name) and
+their fee and balance updated, and each imported student's payments are
+replaced by the rows of the sheet being imported, so re-importing a workbook,
+or a newer copy of it with more rows or corrected amounts, leaves exactly what
+the sheet says. Students missing from a newer workbook are not deleted, so
+their history from older workbooks is kept.
+
+students_fees() returns the same (student, fees) pairs as iter_student_fees,
+one per class a student is in, so every invoice generator can run from the
+store instead of the workbook.
+"""
+import os
+import sys
+import sqlite3
+import argparse
+from contextlib import closing
+import pandas as pd
+from Fee_completion_invoice import iter_workbook, clean_fee_sheet, summarize_student_fees
+
+LEDGER_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fee_ledger.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    name TEXT NOT NULL,
+    fee REAL NOT NULL,
+    remaining REAL NOT NULL,
+    UNIQUE (class_id, name)
+);
+CREATE INDEX IF NOT EXISTS students_by_name ON students (name);
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY,
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    paid_on TEXT NOT NULL,          -- YYYY-MM-DD, '' when the workbook row has no date
+    amount REAL NOT NULL,
+    occurrence INTEGER NOT NULL,    -- tells apart identical payments on the same day
+    UNIQUE (student_id, paid_on, amount, occurrence)
+);
+CREATE INDEX IF NOT EXISTS payments_by_date ON payments (paid_on);
+"""
+
+def connect(db_path=LEDGER_DB):
+    """Open (creating if needed) the ledger database"""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+def connect_copy(db_path=LEDGER_DB):
+    """In-memory copy of the ledger (empty if it does not exist yet), for trying an
+    import without changing the database file"""
+    conn = connect(":memory:")
+    if os.path.exists(db_path):
+        with closing(sqlite3.connect(db_path)) as source:
+            source.backup(conn)
+    return conn
+
+def sheet_payments(df):
+    """(student, paid_on, amount, occurrence) rows, in sheet order, for every row of a cleaned
+    fee sheet with a Paid amount (negative refunds and corrections included, as in the totals)"""
+    paid = df[df['Paid'].notna()]
+    students = paid['Student'].astype(str).str.strip()
+    paid_on = paid['Date'].dt.strftime('%Y-%m-%d').fillna('')
+    amounts = paid['Paid'].astype(float)
+    occurrence = pd.DataFrame({'s': students, 'd': paid_on, 'a': amounts}).groupby(['s', 'd', 'a']).cumcount()
+    return zip(students, paid_on, amounts, occurrence)
+
+def import_workbook(conn, excel_file):
+    """Upsert every sheet of a fee workbook into the ledger in one transaction.
+    Returns {'classes': sheet names, 'students': students in the workbook,
+    'payments_added': net change in stored payment rows}."""
+    classes = []
+    students = payments_added = 0
+
+    with conn:
+        # One sheet in memory at a time; the transaction still covers the whole workbook
+        for sheet, df in iter_workbook(excel_file):
+            df = clean_fee_sheet(df)
+            classes.append(sheet)
+            conn.execute("INSERT INTO classes (name) VALUES (?) ON CONFLICT (name) DO NOTHING", (sheet,))
+            class_id = conn.execute("SELECT id FROM classes WHERE name = ?", (sheet,)).fetchone()[0]
+
+            students_fees = summarize_student_fees({sheet: df})
+            conn.executemany(
+                "INSERT INTO students (class_id, name, fee, remaining) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (class_id, name) DO UPDATE SET fee = excluded.fee, remaining = excluded.remaining",
+                [(class_id, name, fees['total_fees'], fees['remaining_fees']) for name, fees in students_fees.items()]
+            )
+            students += len(students_fees)
+
+            # The sheet is the whole truth for its students: replace their payments, in row order
+            student_ids = dict(conn.execute("SELECT name, id FROM students WHERE class_id = ?", (class_id,)))
+            before = conn.total_changes
+            conn.executemany("DELETE FROM payments WHERE student_id = ?", [(student_ids[name],) for name in students_fees])
+            removed = conn.total_changes - before
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO payments (student_id, paid_on, amount, occurrence) VALUES (?, ?, ?, ?)",
+                [(student_ids[name], paid_on, amount, int(occurrence))
+                 for name, paid_on, amount, occurrence in sheet_payments(df)]
+            )
+            payments_added += conn.total_changes - before - removed
+
+    return {'classes': classes, 'students': students, 'payments_added': payments_added}
+
+def _display_date(paid_on):
+    # Undated rows print as 'NaT', as on invoices read straight from the workbook
+    return pd.Timestamp(paid_on).strftime('%d-%m-%Y') if paid_on else 'NaT'
+
+def students_fees(conn, detailed_report=False, classes=None):
+    """[(student, fees)] in class order, as iter_student_fees yields them, from the ledger.
+    A name stored in several classes appears once per class.
+    classes: optional class (sheet) names to restrict to."""
+    query = """
+        SELECT s.id, s.name, c.name, s.fee, s.remaining, COALESCE(SUM(p.amount), 0)
+        FROM students s JOIN classes c ON c.id = s.class_id
+        LEFT JOIN payments p ON p.student_id = s.id
+        {where}
+        GROUP BY s.id
+        ORDER BY c.id, s.id
+    """
+    params = list(classes or ())
+    class_filter = f"c.name IN ({', '.join('?' * len(params))})" if classes else ""
+    where = f"WHERE {class_filter}" if classes else ""
+    rows = conn.execute(query.format(where=where), params).fetchall()
+
+    history = {}
+    if detailed_report:
+        # Like summarize_student_fees: positive payments only, in workbook row order
+        history_query = """
+            SELECT p.student_id, p.paid_on, p.amount FROM payments p
+            JOIN students s ON s.id = p.student_id JOIN classes c ON c.id = s.class_id
+            WHERE p.amount > 0 {class_filter}
+            ORDER BY p.student_id, p.id
+        """
+        history_filter = f"AND {class_filter}" if classes else ""
+        for student_id, paid_on, amount in conn.execute(history_query.format(class_filter=history_filter), params):
+            history.setdefault(student_id, []).append({'date': _display_date(paid_on), 'amount': amount})
+
+    return [(name, {
+        'class_name': class_name,
+        'total_fees': fee,
+        # Same rule as summarize_student_fees: explicit payments, else fee minus balance
+        'paid_fees': paid_sum if paid_sum > 0 else max(fee - remaining, 0.0),
+        'remaining_fees': remaining,
+        'payment_history': history.get(student_id, []) if detailed_report else None,
+    }) for student_id, name, class_name, fee, remaining, paid_sum in rows]
+
+def student_history(conn, student_name):
+    """Payments (refunds and corrections included) of every student with this name, in
+    workbook order: [(class, date, amount)]"""
+    return [(class_name, _display_date(paid_on), amount) for class_name, paid_on, amount in conn.execute("""
+        SELECT c.name, p.paid_on, p.amount
+        FROM students s JOIN classes c ON c.id = s.class_id JOIN payments p ON p.student_id = s.id
+        WHERE s.name = ?
+        ORDER BY c.id, p.id
+    """, (student_name,))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import fee workbooks into the fee ledger and query it")
+    parser.add_argument('--db', default=LEDGER_DB, help="ledger database (default: fee_ledger.sqlite3 next to this script)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_parser = commands.add_parser('import', help="import fee workbooks")
+    import_parser.add_argument('workbooks', nargs='+')
+    history_parser = commands.add_parser('history', help="show a student's payments")
+    history_parser.add_argument('student')
+    args = parser.parse_args(argv)
+
+    with closing(connect(args.db)) as conn:
+        if args.command == 'import':
+            for workbook in args.workbooks:
+                counts = import_workbook(conn, workbook)
+                print(f"{workbook}: {counts['students']} students, {counts['payments_added']} new payments")
+        else:
+            payments = student_history(conn, args.student)
+            if not payments:
+                print(f"No payments recorded for {args.student}")
+                return 1
+            for class_name, date, amount in payments:
+                print(f"{date}  {class_name:<15}{amount:>12,.2f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import io
+from reportlab.lib.pagesizes import A4
+from reportlab.lib import colors
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as pdfcanvas
+from invoice_renderer import ACADEMY_NAME, TITLE_COLOR, HEADER_COLOR, TOTAL_ROW_COLOR, BODY_ROW_COLOR
+
+# Page geometry of SimpleDocTemplate(pagesize=A4): 72pt margins, 6pt frame padding
+PAGE_WIDTH, PAGE_HEIGHT = A4
+CONTENT_LEFT = 72 + 6
+CONTENT_TOP = PAGE_HEIGHT - 72 - 6
+CONTENT_BOTTOM = 72 + 6
+CONTENT_WIDTH = PAGE_WIDTH - 2 * CONTENT_LEFT
+
+TITLE_SIZE = 16
+TITLE_SPACE_AFTER = 20
+HEADER_SPACE_AFTER = 20
+TEXT_SIZE = 10
+TEXT_LEADING = 12
+NOTE_SPACE_BEFORE = 6  # the sample sheet's Italic style inherits BodyText's spaceBefore
+CELL_PADDING = 3
+
+# The fixed-layout tables; mirrors the 'invoice' and 'faculty' entries of TABLE_STYLES
+CANVAS_TABLE_STYLES = {
+    'invoice': {'header_size': 12, 'header_padding': 12, 'grid': colors.black, 'body_fill': None, 'bold_total': False},
+    'faculty': {'header_size': 10, 'header_padding': 10, 'grid': colors.grey, 'body_fill': BODY_ROW_COLOR, 'bold_total': True},
+}
+
+class CanvasInvoiceRenderer:
+    """Draws the small fixed-layout invoices (header, info lines, one table, note)
+    straight onto a canvas, skipping platypus layout entirely.
+
+    Coordinates reproduce what InvoiceRenderer.render lays out for the same
+    content, so both renderers produce the same page. Only documents that fit on
+    one page can be drawn this way; check fits() and fall back to InvoiceRenderer.
+    """
+
+    def __init__(self, title_leading=None):
+        # ParagraphStyle's default leading is 12, less than the 16pt title font
+        self.title_leading = title_leading or 12
+
+    def table_top(self, info_lines, info_space):
+        header = 2 * (self.title_leading + TITLE_SPACE_AFTER) + HEADER_SPACE_AFTER
+        return CONTENT_TOP - header - info_lines * TEXT_LEADING - info_space
+
+    def fits(self, info_lines, info_space, rows, style, note_space):
+        """Whether header, info lines, a table of `rows` rows (header row included) and
+        the note fit on one page"""
+        spec = CANVAS_TABLE_STYLES[style]
+        table_height = TEXT_LEADING + CELL_PADDING + spec['header_padding'] + (rows - 1) * (TEXT_LEADING + 2 * CELL_PADDING)
+        bottom = self.table_top(info_lines, info_space) - table_height - note_space - NOTE_SPACE_BEFORE - TEXT_LEADING
+        return bottom >= CONTENT_BOTTOM
+
+    def render(self, title, info, info_space, data, col_widths, style, note, note_space=30):
+        """Draw the invoice and return the PDF bytes.
+        info: [(label, value)] lines; data: table rows, header first and total last."""
+        buffer = io.BytesIO()
+        canvas = pdfcanvas.Canvas(buffer, pagesize=A4, pageCompression=1)
+        # All text goes into one text object, drawn over the table's fills and grid
+        text = canvas.beginText()
+
+        y = CONTENT_TOP
+        text.setFillColor(TITLE_COLOR)
+        text.setFont("Helvetica-Bold", TITLE_SIZE)
+        for line in (ACADEMY_NAME, title):
+            y -= self.title_leading
+            self.centred(text, CONTENT_LEFT + CONTENT_WIDTH / 2, y + self.title_leading - TITLE_SIZE, line, "Helvetica-Bold", TITLE_SIZE)
+            y -= TITLE_SPACE_AFTER
+
+        y -= HEADER_SPACE_AFTER
+        text.setFillColor(colors.black)
+        for label, value in info:
+            y -= TEXT_LEADING
+            self.label_line(text, y, f"{label}:", f" {value}", "Helvetica-Bold", "Helvetica")
+        y -= info_space
+
+        y = self.table(canvas, text, y, data, col_widths, CANVAS_TABLE_STYLES[style])
+
+        y -= note_space + NOTE_SPACE_BEFORE + TEXT_LEADING
+        text.setFillColor(colors.black)
+        self.label_line(text, y, "Note:", f" {note}", "Helvetica-BoldOblique", "Helvetica-Oblique")
+
+        canvas.drawText(text)
+        canvas.showPage()
+        canvas.save()
+        return buffer.getvalue()
+
+    def centred(self, text, x, y, line, font, size):
+        text.setTextOrigin(x - stringWidth(line, font, size) / 2, y)
+        text.textOut(line)
+
+    def label_line(self, text, y, label, value, label_font, value_font):
+        # A paragraph line "<b>label</b> value": baseline sits leading - size above the line's bottom
+        text.setTextOrigin(CONTENT_LEFT, y + TEXT_LEADING - TEXT_SIZE)
+        text.setFont(label_font, TEXT_SIZE)
+        text.textOut(label)
+        text.setFont(value_font, TEXT_SIZE)
+        text.textOut(value)
+
+    def table(self, canvas, text, top, data, col_widths, spec):
+        """Draw a centred grid table whose top edge is at `top` (cell text into the
+        text object); returns its bottom edge"""
+        width = sum(col_widths)
+        left = CONTENT_LEFT + (CONTENT_WIDTH - width) / 2
+        heights = [TEXT_LEADING + CELL_PADDING + spec['header_padding']] + [TEXT_LEADING + 2 * CELL_PADDING] * (len(data) - 1)
+        edges = [top]
+        for height in heights:
+            edges.append(edges[-1] - height)
+        bottom = edges[-1]
+        col_edges = [left]
+        for col_width in col_widths:
+            col_edges.append(col_edges[-1] + col_width)
+
+        # Backgrounds: header row, body rows (optional), total row
+        canvas.setFillColor(HEADER_COLOR)
+        canvas.rect(left, edges[1], width, heights[0], stroke=0, fill=1)
+        if spec['body_fill'] is not None and len(data) > 2:
+            canvas.setFillColor(spec['body_fill'])
+            canvas.rect(left, edges[-2], width, edges[1] - edges[-2], stroke=0, fill=1)
+        canvas.setFillColor(TOTAL_ROW_COLOR)
+        canvas.rect(left, bottom, width, heights[-1], stroke=0, fill=1)
+
+        # Cell text, centred; baseline at bottom padding + (leading - size) above the row's bottom
+        for index, row in enumerate(data):
+            header_row = index == 0
+            total_row = index == len(data) - 1 and spec['bold_total']
+            size = spec['header_size'] if header_row else TEXT_SIZE
+            font = "Helvetica-Bold" if header_row or total_row else "Helvetica"
+            padding = spec['header_padding'] if header_row else CELL_PADDING
+            baseline = edges[index + 1] + padding + TEXT_LEADING - size
+            text.setFillColor(colors.white if header_row else colors.black)
+            text.setFont(font, size)
+            for cell, x0, x1 in zip(row, col_edges, col_edges[1:]):
+                self.centred(text, (x0 + x1) / 2, baseline, str(cell), font, size)
+
+        canvas.setStrokeColor(spec['grid'])
+        canvas.setLineWidth(1)
+        canvas.setLineCap(1)
+        canvas.setLineJoin(1)
+        canvas.lines(
+            [(left, y, left + width, y) for y in edges] +
+            [(x, bottom, x, top) for x in col_edges]
+        )
+        return bottom
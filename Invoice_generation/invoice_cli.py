@@ -0,0 +1,234 @@
+"""Headless batch invoice generation, for cron and other scripted runs.
+
+    python invoice_cli.py "fees/*.xlsx" "attendance/*.csv" --out /srv/invoices --workers 8
+    python invoice_cli.py "AA Fee.xlsx" --mode student --layout merged --dry-run
+
+Excel workbooks (.xls/.xlsx) are student fee inputs, CSV files are faculty
+inputs: either prepared salary CSVs (with Hours and Total) or the monthly
+Attendance_tracking/attendance_YYYY_MM.csv files, priced from the --rates table
+(see attendance_payroll.py). Each month of attendance gets its own invoices:
+
+    python invoice_cli.py "../Attendance_tracking/attendance_2025_*.csv" --rates payroll_rates.csv
+
+With --ledger, student workbooks are first imported into the SQLite fee ledger
+(see fee_ledger.py) and invoices are generated from the stored history. A dry
+run imports into an in-memory copy of the ledger, leaving the file unchanged.
+
+Output layout under --out:
+
+    students/<workbook name>/            combined report, merged PDF
+    students/<workbook name>/detailed/   one detailed invoice per student
+    faculty/<year>/<month>/              faculty invoices and combined report
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+from contextlib import contextmanager, closing
+import Fee_completion_invoice as student_invoices
+import faculty_salary_generation_invoice as faculty_invoices
+import attendance_payroll
+import fee_ledger
+from invoice_output import InvoiceManifest, iter_items
+
+STUDENT_EXTENSIONS = ('.xls', '.xlsx')
+FACULTY_EXTENSIONS = ('.csv',)
+
+class StageTimer:
+    """Wall-clock time and run count per named stage, reported at the end of a run"""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds, count = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (seconds + time.perf_counter() - start, count + 1)
+
+    def print_summary(self):
+        print("=" * 60)
+        print(f"{'Stage':<30}{'Runs':>8}{'Seconds':>12}")
+        for name, (seconds, count) in self.stages.items():
+            print(f"{name:<30}{count:>8}{seconds:>12.2f}")
+        print(f"{'Total':<30}{'':>8}{sum(s for s, _ in self.stages.values()):>12.2f}")
+
+def expand_inputs(patterns):
+    """Expand file names and glob patterns, keeping order and dropping duplicates"""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"No files match {pattern}")
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+def count_pending(output_dir, items, digest, manifest_key=None):
+    """How many of items ({key: data} or (key, data) pairs) would be rendered (rather than reused) in output_dir;
+    manifest_key as for render_incremental"""
+    manifest = InvoiceManifest(output_dir)
+    return sum(manifest.lookup(manifest_key(key, data) if manifest_key else key, digest(key, data)) is None
+               for key, data in iter_items(items))
+
+def run_students(excel_file, args, timer):
+    out_dir = os.path.join(args.out, "students", os.path.splitext(os.path.basename(excel_file))[0])
+    detailed_dir = os.path.join(out_dir, "detailed")
+
+    if args.ledger:
+        # A dry run imports into a throwaway copy, so it reports exactly what the real run would
+        connect = fee_ledger.connect_copy if args.dry_run else fee_ledger.connect
+        with timer.stage("student: ledger import"), closing(connect(args.ledger)) as conn:
+            counts = fee_ledger.import_workbook(conn, excel_file)
+            recorded = "would be recorded" if args.dry_run else "recorded"
+            print(f"{excel_file}: {counts['payments_added']} new payments {recorded} in {args.ledger}")
+            students_fees = fee_ledger.students_fees(conn, detailed_report=args.individual, classes=counts['classes'])
+    else:
+        # Read one sheet at a time as the invoices below ask for students, so a huge
+        # workbook is never in memory all at once
+        students_fees = student_invoices.iter_student_fees(excel_file, detailed_report=args.individual)
+
+    # Collects each student's totals on the way through; also serves as the student count
+    report = student_invoices.CombinedReport()
+    students = report.collect(students_fees)
+
+    if args.dry_run:
+        with timer.stage("student: read"):
+            if args.individual and args.layout != "merged" and args.incremental:
+                pending = count_pending(detailed_dir, students, student_invoices.detailed_invoice_hash,
+                                        student_invoices.detailed_invoice_key)
+            else:
+                pending = sum(1 for _ in students)
+        print(f"{excel_file}: {len(report)} students")
+        if args.individual and args.layout == "merged":
+            print(f"  would write merged detailed invoices to {out_dir}")
+        elif args.individual:
+            print(f"  would write {len(report)} detailed invoices to {detailed_dir} ({pending} to render)")
+        if report and args.combined:
+            print(f"  would write the combined report to {out_dir}")
+        return
+
+    if args.individual and args.layout == "merged":
+        # The merged PDF is laid out as one document, so it needs every student up front
+        with timer.stage("student: read"):
+            students_fees = list(students)
+        if students_fees:
+            with timer.stage("student: merged invoices"):
+                student_invoices.generate_merged_detailed_invoices(students_fees, output_dir=out_dir)
+    elif args.individual:
+        with timer.stage("student: detailed invoices"):
+            student_invoices.generate_detailed_invoices(
+                students, workers=args.workers, output_dir=detailed_dir, incremental=args.incremental
+            )
+    else:
+        with timer.stage("student: read"):
+            for _ in students:
+                pass
+    print(f"{excel_file}: {len(report)} students")
+    if report and args.combined:
+        with timer.stage("student: combined report"):
+            student_invoices.generate_combined_invoice(report, output_dir=out_dir)
+
+def run_faculty(csv_file, args, timer):
+    with timer.stage("faculty: read"):
+        months = attendance_payroll.read_salary_months(csv_file, rates_file=args.rates)
+    for df, month, year in months:
+        run_faculty_month(csv_file, df, month, year, args, timer)
+
+def run_faculty_month(csv_file, df, month, year, args, timer):
+    with timer.stage("faculty: aggregate"):
+        salary_summary = faculty_invoices.summarize_salary(df)
+    out_dir = os.path.join(args.out, "faculty", str(year), str(month))
+    print(f"{csv_file}: {len(salary_summary['by_faculty'])} faculty, {month} {year}")
+
+    if args.dry_run:
+        if args.individual and args.layout == "merged":
+            print(f"  would write merged faculty invoices to {out_dir}")
+        elif args.individual:
+            faculty_rows = {faculty: faculty_invoices.faculty_invoice_rows(salary_summary, faculty)
+                            for faculty in salary_summary['by_faculty']}
+            digest = lambda faculty, rows: faculty_invoices.faculty_invoice_hash(faculty, rows, month, year)
+            pending = count_pending(out_dir, faculty_rows, digest) if args.incremental else len(faculty_rows)
+            print(f"  would write {len(faculty_rows)} faculty invoices to {out_dir} ({pending} to render)")
+        if args.combined:
+            print(f"  would write the combined report to {out_dir}")
+        return
+
+    if args.individual and args.layout == "merged":
+        with timer.stage("faculty: merged invoices"):
+            faculty_invoices.generate_merged_faculty_invoices(salary_summary, month, year, output_dir=out_dir)
+    elif args.individual:
+        with timer.stage("faculty: invoices"):
+            faculty_invoices.generate_faculty_invoices(
+                salary_summary, month, year, incremental=args.incremental, output_dir=out_dir, fast=args.fast
+            )
+    if args.combined:
+        with timer.stage("faculty: combined report"):
+            faculty_invoices.generate_combined_invoice(salary_summary, month, year, output_dir=out_dir)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate Adhyay Academy student fee and faculty salary invoices")
+    parser.add_argument('inputs', nargs='+', help="input files or glob patterns (.xls/.xlsx: student fees, .csv: faculty salary)")
+    parser.add_argument('--mode', choices=('student', 'faculty', 'both'), default='both',
+                        help="which inputs to process (default: both)")
+    parser.add_argument('--out', default='invoices', help="output directory (default: invoices)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for detailed invoices (default: CPU count)")
+    parser.add_argument('--layout', choices=('individual', 'merged'), default='individual',
+                        help="one PDF per student/faculty member, or one merged printable PDF (default: individual)")
+    parser.add_argument('--no-individual', dest='individual', action='store_false',
+                        help="skip per-student/faculty invoices")
+    parser.add_argument('--no-combined', dest='combined', action='store_false',
+                        help="skip the combined report")
+    parser.add_argument('--fast', action='store_true',
+                        help="draw faculty invoices straight on a canvas instead of through platypus layout")
+    parser.add_argument('--full', dest='incremental', action='store_false',
+                        help="re-render every invoice instead of reusing unchanged ones (invoices print the "
+                             "date, so only those rendered earlier the same day are reused)")
+    parser.add_argument('--rates', default=attendance_payroll.RATES_FILE,
+                        help="hourly rate table for attendance CSVs (default: payroll_rates.csv next to this script)")
+    parser.add_argument('--ledger', nargs='?', const=fee_ledger.LEDGER_DB, default=None,
+                        help="import student workbooks into the fee ledger and invoice from it "
+                             "(default path: fee_ledger.sqlite3 next to this script)")
+    parser.add_argument('--dry-run', action='store_true', help="read inputs and report what would be generated")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    timer = StageTimer()
+
+    runs = []
+    for path in expand_inputs(args.inputs):
+        extension = os.path.splitext(path)[1].lower()
+        if extension in STUDENT_EXTENSIONS and args.mode in ('student', 'both'):
+            runs.append((run_students, path))
+        elif extension in FACULTY_EXTENSIONS and args.mode in ('faculty', 'both'):
+            runs.append((run_faculty, path))
+        else:
+            print(f"Skipping {path} (not a {args.mode} input)")
+    if not runs:
+        print("No inputs to process.")
+        return 1
+
+    failures = 0
+    for run, path in runs:
+        if not os.path.exists(path):
+            print(f"Error: input file '{path}' not found!")
+            failures += 1
+            continue
+        try:
+            run(path, args, timer)
+        except Exception as e:
+            print(f"Error processing {path}: {e}")
+            failures += 1
+
+    timer.print_summary()
+    print(f"Processed {len(runs) - failures} of {len(runs)} input(s){' (dry run)' if args.dry_run else ''}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import io
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from invoice_output import stream_zip
+
+class JobCancelled(Exception):
+    pass
+
+class InvoiceJob:
+    """Progress and result of one background invoice batch.
+
+    The worker thread advances `done` as each PDF lands in the ZIP; the UI only
+    reads the fields, so no Streamlit calls happen off the script thread.
+    """
+
+    def __init__(self, label, total, filename):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.total = total
+        self.filename = filename
+        self.done = 0
+        self.count = 0
+        self.started = time.time()
+        self.finished = None
+        self.error = None
+        self.result = None
+        self.cancelled = False
+
+    @property
+    def status(self):
+        if self.finished is None:
+            return "running"
+        if self.cancelled:
+            return "cancelled"
+        return "failed" if self.error else "done"
+
+    @property
+    def progress(self):
+        return min(self.done / max(self.total, 1), 1.0)
+
+    def eta_seconds(self):
+        """Seconds left at the average rate so far, or None before the first PDF"""
+        if not self.done:
+            return None
+        elapsed = time.time() - self.started
+        return elapsed / self.done * max(self.total - self.done, 0)
+
+    def expect(self, count):
+        """Add count PDFs to the total, for batches whose size is only known as their input is read"""
+        self.total += count
+
+    def cancel(self):
+        self.cancelled = True
+
+class JobRunner:
+    """Runs invoice batches on a small thread pool, outside any Streamlit script run.
+
+    Hold one instance in st.cache_resource: jobs survive reruns and are visible to
+    the session that started them (by id), and several batches from different
+    staff run side by side. Finished jobs are dropped after `keep_seconds`.
+    """
+
+    def __init__(self, max_jobs=4, keep_seconds=3600):
+        self.executor = ThreadPoolExecutor(max_workers=max_jobs, thread_name_prefix="invoice-job")
+        self.keep_seconds = keep_seconds
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, label, total, entries, filename):
+        """Start a job that writes the (file name, PDF bytes) pairs from entries(job) into a ZIP.
+
+        entries is a callable taking the job and returning the iterable, so all reading
+        and rendering happens on the worker thread. total is the number of PDFs known up
+        front; entries can add more with job.expect() as it reads its input.
+        """
+        self.prune()
+        job = InvoiceJob(label, total, filename)
+        with self.lock:
+            self.jobs[job.id] = job
+        self.executor.submit(self._run, job, entries)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def prune(self):
+        cutoff = time.time() - self.keep_seconds
+        with self.lock:
+            for job_id in [job_id for job_id, job in self.jobs.items() if job.finished and job.finished < cutoff]:
+                del self.jobs[job_id]
+
+    def _run(self, job, entries):
+        def tracked():
+            for entry in entries(job):
+                if job.cancelled:
+                    raise JobCancelled()
+                yield entry
+                job.done += 1
+
+        try:
+            zip_buffer = io.BytesIO()
+            job.count = stream_zip(tracked(), zip_buffer)
+            job.result = zip_buffer.getvalue()
+        except JobCancelled:
+            pass
+        except Exception as e:
+            job.error = str(e)
+        finally:
+            job.finished = time.time()
@@ -0,0 +1,230 @@
+import os
+import json
+import hashlib
+import zipfile
+import tempfile
+import threading
+from collections import OrderedDict, deque
+from invoice_renderer import TEMPLATE_VERSION
+
+MANIFEST_NAME = "invoice_manifest.json"
+
+def replace_file(path, data):
+    """Write bytes to path through a uniquely named temp file in the same directory and a rename,
+    so concurrent readers and writers (e.g. two background jobs) only ever see a complete file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file private to its owner; output files are world-readable as before
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_pdf(pdf_bytes, output_dir, filename):
+    """Write rendered PDF bytes to output_dir/filename and return the path"""
+    os.makedirs(output_dir, exist_ok=True)
+    invoice_file = os.path.join(output_dir, filename)
+    replace_file(invoice_file, pdf_bytes)
+    return invoice_file
+
+def stream_zip(entries, out):
+    """Write (file name, PDF bytes) entries into a ZIP one at a time.
+
+    entries can be any iterable, including a generator that renders lazily, so
+    only one PDF is held at a time. PDFs are already compressed, so entries are
+    stored rather than deflated. Returns the number of entries written.
+    """
+    count = 0
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        for filename, pdf_bytes in entries:
+            zf.writestr(filename, pdf_bytes)
+            count += 1
+    return count
+
+def iter_items(items):
+    """(key, data) pairs of a {key: data} dict, or of an iterable of such pairs
+    (e.g. a generator reading a workbook one sheet at a time)"""
+    return items.items() if isinstance(items, dict) else items
+
+def content_hash(*parts):
+    """Hash of everything that goes into one invoice, plus the template version.
+    parts must be JSON-serialisable (dicts, lists, strings, numbers)."""
+    payload = json.dumps([TEMPLATE_VERSION, *parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# One lock per manifest file, shared by every job in this process
+_MANIFEST_LOCKS = {}
+_MANIFEST_LOCKS_GUARD = threading.Lock()
+
+def _manifest_lock(path):
+    with _MANIFEST_LOCKS_GUARD:
+        return _MANIFEST_LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+
+def _file_id(path):
+    # Changes whenever the file is replaced, so a run can tell its PDF was overwritten
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+class InvoiceManifest:
+    """Record of the PDFs already rendered into one output directory.
+
+    Stored as output_dir/invoice_manifest.json, mapping each student or faculty
+    member to the content hash their PDF was rendered from and its file name.
+    An entry whose hash still matches (and whose file still exists) can be
+    reused instead of rendered again.
+
+    Several runs may share an output directory (e.g. concurrent Streamlit jobs):
+    save() merges this run's entries into the manifest on disk rather than
+    overwriting it, and drops the entry of any PDF another run has since rewritten.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = self._load()
+        self.recorded = {}  # key -> (entry, file id of the PDF this run wrote)
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {self.path}: {e}")
+            return {}
+
+    def lookup(self, key, digest):
+        """Path of the stored PDF for key if it was rendered from digest, else None"""
+        entry = self.entries.get(key)
+        if entry is None or entry["hash"] != digest:
+            return None
+        invoice_file = os.path.join(self.output_dir, entry["file"])
+        return invoice_file if os.path.exists(invoice_file) else None
+
+    def record(self, key, digest, filename):
+        """Record the PDF just written to output_dir/filename as rendered from digest"""
+        entry = {"hash": digest, "file": filename}
+        self.entries[key] = entry
+        self.recorded[key] = (entry, _file_id(os.path.join(self.output_dir, filename)))
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with _manifest_lock(self.path):
+            entries = self._load()
+            for key, (entry, file_id) in self.recorded.items():
+                if _file_id(os.path.join(self.output_dir, entry["file"])) == file_id:
+                    entries[key] = entry
+                else:
+                    # Another run rewrote the PDF; no entry is safer than a wrong one (it is just rendered again)
+                    entries.pop(key, None)
+            self.entries, self.recorded = entries, {}
+            # Write then rename, so an interrupted run never leaves a truncated manifest
+            replace_file(self.path, json.dumps(entries, indent=1, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+def render_incremental(items, output_dir, digest, render_batch, manifest_key=None):
+    """Yield (file name, PDF bytes) for items, re-rendering only what changed.
+
+    items: {key: data} or an iterable of (key, data) pairs. digest(key, data)
+    hashes one item's content; render_batch(pairs) yields (file name, PDF bytes)
+    for an iterable of (key, data) pairs, in the same order. Items whose digest
+    matches the manifest in output_dir are read back from disk; the rest are
+    rendered, written to output_dir and recorded. Yields in items order; the
+    manifest is saved when the generator finishes or is closed. manifest_key(key,
+    data) names an item's manifest entry when key alone is not unique (default: key).
+
+    Items are only pulled as render_batch asks for more work, so with a lazy
+    render_batch a streamed input is never held in memory all at once.
+    """
+    manifest = InvoiceManifest(output_dir)
+    pending = deque()  # (key, digest, stored path or None) in items order, not yet yielded
+    counts = {'changed': 0, 'unchanged': 0}
+
+    def changed():
+        for key, data in iter_items(items):
+            item_digest = digest(key, data)
+            entry = manifest_key(key, data) if manifest_key else key
+            stored = manifest.lookup(entry, item_digest)
+            pending.append((entry, item_digest, stored))
+            if stored is None:
+                counts['changed'] += 1
+                yield key, data
+            else:
+                counts['unchanged'] += 1
+
+    def reused():
+        # Unchanged items queued ahead of the next rendered one (or left at the end)
+        while pending and pending[0][2] is not None:
+            _, _, stored = pending.popleft()
+            with open(stored, "rb") as f:
+                yield os.path.basename(stored), f.read()
+
+    try:
+        for filename, pdf_bytes in render_batch(changed()):
+            yield from reused()
+            key, item_digest, _ = pending.popleft()
+            write_pdf(pdf_bytes, output_dir, filename)
+            manifest.record(key, item_digest, filename)
+            yield filename, pdf_bytes
+        yield from reused()
+        print(f"{output_dir}: {counts['changed']} rendered, {counts['unchanged']} unchanged")
+    finally:
+        manifest.save()
+
+class PdfCache:
+    """In-memory LRU of rendered PDFs keyed by content hash, bounded by total size.
+    Safe to share between threads (e.g. Streamlit sessions)."""
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest):
+        """(file name, PDF bytes) cached under digest, or None"""
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is not None:
+                self.entries.move_to_end(digest)
+            return entry
+
+    def put(self, digest, filename, pdf_bytes):
+        with self.lock:
+            if digest in self.entries:
+                self.size -= len(self.entries.pop(digest)[1])
+            self.entries[digest] = (filename, pdf_bytes)
+            self.size += len(pdf_bytes)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+def render_cached(items, cache, digest, render_batch):
+    """Like render_incremental, but reusing PDFs from an in-memory PdfCache instead of disk.
+    Yields (file name, PDF bytes) in items order; only cache misses go to render_batch."""
+    pending = deque()  # (digest, cached entry or None) in items order, not yet yielded
+
+    def missing():
+        for key, data in iter_items(items):
+            item_digest = digest(key, data)
+            entry = cache.get(item_digest)
+            pending.append((item_digest, entry))
+            if entry is None:
+                yield key, data
+
+    def cached():
+        while pending and pending[0][1] is not None:
+            yield pending.popleft()[1]
+
+    for filename, pdf_bytes in render_batch(missing()):
+        yield from cached()
+        item_digest, _ = pending.popleft()
+        cache.put(item_digest, filename, pdf_bytes)
+        yield filename, pdf_bytes
+    yield from cached()
@@ -0,0 +1,294 @@
+import io
+import copy
+from itertools import islice
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak, Flowable
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from reportlab import rl_config
+
+# Content streams are Flate-compressed (pageCompression below); reportlab also
+# ASCII85-encodes them by default, which makes every stream 25% larger for the
+# sake of 7-bit-clean output nobody here needs. Process-wide, as reportlab only
+# reads it from rl_config.
+rl_config.useA85 = 0
+
+# Bump whenever the invoice layout or wording changes, so PDFs recorded in an
+# output directory's manifest are rendered again rather than reused
+TEMPLATE_VERSION = 2
+
+ACADEMY_NAME = "Adhyay Academy"
+TITLE_COLOR = colors.HexColor("#2E4053")
+HEADER_COLOR = colors.HexColor("#34495E")
+TOTAL_ROW_COLOR = colors.HexColor("#EAECEE")
+BODY_ROW_COLOR = colors.HexColor("#F8F9F9")
+
+# Body rows per table in long reports; reportlab's layout cost grows faster than
+# linearly with table size, so long sections are split into tables of this many rows
+TABLE_CHUNK_ROWS = 200
+
+# Table style commands by name; each becomes one TableStyle per renderer
+TABLE_STYLES = {
+    # Student fee invoice (shaded last row)
+    'invoice': [
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, -1), (-1, -1), TOTAL_ROW_COLOR),
+    ],
+    # Student detailed report: current status and payment history
+    'detailed': [
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ],
+    # Combined student fee report (bold total row)
+    'combined': [
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, -1), (-1, -1), TOTAL_ROW_COLOR),
+        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ],
+    # Combined student fee report: a chunk of rows without a closing total
+    'combined_rows': [
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ],
+    # Combined student fee report: grand total line
+    'combined_total': [
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('BACKGROUND', (0, 0), (-1, -1), TOTAL_ROW_COLOR),
+        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ],
+    # Faculty salary invoice
+    'faculty': [
+        ("BACKGROUND", (0, 0), (-1, 0), HEADER_COLOR),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+        ("BACKGROUND", (0, 1), (-1, -2), BODY_ROW_COLOR),
+        ("BACKGROUND", (0, -1), (-1, -1), TOTAL_ROW_COLOR),
+        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+    ],
+    # Combined faculty salary report
+    'faculty_combined': [
+        ("BACKGROUND", (0, 0), (-1, 0), HEADER_COLOR),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (2, 0), (-1, -1), "CENTER"),  # Center align numbers
+        ("ALIGN", (0, 0), (1, -1), "LEFT"),     # Left align text
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+        ("BACKGROUND", (0, -1), (-1, -1), TOTAL_ROW_COLOR),
+        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+    ],
+    # Combined faculty salary report: a chunk of rows without a closing subtotal
+    'faculty_combined_rows': [
+        ("BACKGROUND", (0, 0), (-1, 0), HEADER_COLOR),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ALIGN", (2, 0), (-1, -1), "CENTER"),
+        ("ALIGN", (0, 0), (1, -1), "LEFT"),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("BOTTOMPADDING", (0, 0), (-1, 0), 10),
+        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+    ],
+    # Combined faculty salary report: grand total line
+    'faculty_combined_total': [
+        ("ALIGN", (2, 0), (-1, -1), "CENTER"),
+        ("ALIGN", (0, 0), (1, -1), "LEFT"),
+        ("BACKGROUND", (0, 0), (-1, -1), TOTAL_ROW_COLOR),
+        ("FONTNAME", (0, 0), (-1, -1), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 1, colors.grey),
+    ],
+}
+
+class Bookmark(Flowable):
+    """Zero-size flowable that adds a PDF outline entry pointing at the page it lands on"""
+
+    def __init__(self, key, title, level=0):
+        super().__init__()
+        self.key = key
+        self.title = title
+        self.level = level
+
+    def wrap(self, available_width, available_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=self.level)
+
+class FixedForm(Flowable):
+    """Flowables whose content never varies (academy header, footer note) drawn
+    as one PDF form XObject.
+
+    The form is written to the document the first time it is drawn; every later
+    occurrence, e.g. on each page of a merged PDF, is a single reference to it.
+    Spacing between the grouped flowables follows the frame's rules, so the
+    layout is the same as adding them one by one.
+    """
+
+    def __init__(self, name, flowables):
+        super().__init__()
+        self.name = name
+        self.flowables = flowables
+        self.placed = []
+
+    def getSpaceBefore(self):
+        return self.flowables[0].getSpaceBefore()
+
+    def getSpaceAfter(self):
+        return self.flowables[-1].getSpaceAfter()
+
+    def wrap(self, available_width, available_height):
+        offsets = []
+        y = 0
+        previous_after = None
+        for flowable in self.flowables:
+            if previous_after is not None:
+                y += previous_after + max(flowable.getSpaceBefore() - previous_after, 0)
+            _, height = flowable.wrap(available_width, available_height)
+            y += height
+            offsets.append(y)
+            previous_after = flowable.getSpaceAfter()
+        self.width, self.height = available_width, y
+        self.placed = [(flowable, y - offset) for flowable, offset in zip(self.flowables, offsets)]
+        return self.width, self.height
+
+    def draw(self):
+        canvas = self.canv
+        if not canvas.hasForm(self.name):
+            # Padded bounding box, so descenders of the bottom line are not clipped
+            canvas.beginForm(self.name, -10, -10, self.width + 10, self.height + 10)
+            for flowable, y in self.placed:
+                flowable.drawOn(canvas, 0, y)
+            canvas.endForm()
+        canvas.doForm(self.name)
+
+class InvoiceRenderer:
+    """Builds the paragraph styles, table styles and header/footer flowables once
+    and renders any number of invoice documents with them.
+
+    Keep one renderer per module (or per worker process) and reuse it; only the
+    per-document content (info lines, table rows) is created on each render.
+    """
+
+    def __init__(self, title_leading=None):
+        self.styles = getSampleStyleSheet()
+        title_options = {'leading': title_leading} if title_leading else {}
+        self.title_style = ParagraphStyle(
+            name="TitleStyle",
+            fontSize=16,
+            alignment=1,
+            spaceAfter=20,
+            textColor=TITLE_COLOR,
+            **title_options,
+        )
+        self.info_style = self.styles["Normal"]
+        self.note_style = self.styles["Italic"]
+        self.table_styles = {name: TableStyle(commands) for name, commands in TABLE_STYLES.items()}
+        self._headers = {}
+        self._footers = {}
+
+    def header(self, title, as_form=False):
+        """Academy name, document title and spacing, parsed once per title.
+        as_form draws the name and title as a form XObject (see FixedForm)."""
+        if title not in self._headers:
+            self._headers[title] = (f"Header{len(self._headers)}", [
+                Paragraph(f"<b>{ACADEMY_NAME}</b>", self.title_style),
+                Paragraph(f"<b>{title}</b>", self.title_style),
+            ])
+        name, paragraphs = self._headers[title]
+        # Layout state is stored on the flowable, so every document gets its own copy
+        paragraphs = [copy.copy(paragraph) for paragraph in paragraphs]
+        return ([FixedForm(name, paragraphs)] if as_form else paragraphs) + [Spacer(1, 20)]
+
+    def footer(self, note, space_before=30, as_form=False):
+        """Spacing and the italic note line, parsed once per note.
+        as_form draws the note as a form XObject (see FixedForm)."""
+        if note not in self._footers:
+            self._footers[note] = (f"Footer{len(self._footers)}", Paragraph(f"<b>Note:</b> {note}", self.note_style))
+        name, paragraph = self._footers[note]
+        paragraph = copy.copy(paragraph)
+        return [Spacer(1, space_before), FixedForm(name, [paragraph]) if as_form else paragraph]
+
+    def info(self, label, value):
+        return Paragraph(f"<b>{label}:</b> {value}", self.info_style)
+
+    def table(self, data, col_widths, style):
+        table = Table(data, colWidths=col_widths)
+        table.setStyle(self.table_styles[style])
+        return table
+
+    def long_tables(self, header, rows, col_widths, style, total_row=None, total_style=None,
+                    chunk_rows=TABLE_CHUNK_ROWS):
+        """Lay out one report section as LongTables of at most chunk_rows rows each.
+
+        rows may be any iterable (e.g. a generator); it is consumed one chunk at a
+        time. Every table repeats header at the top of each page it spans. The last
+        table ends with total_row (if given) and is styled with total_style.
+        """
+        rows = iter(rows)
+        tables = []
+        chunk = list(islice(rows, chunk_rows))
+        while True:
+            next_chunk = list(islice(rows, chunk_rows))
+            closing = not next_chunk and total_row is not None
+            data = [header] + chunk + ([total_row] if closing else [])
+            table = LongTable(data, colWidths=col_widths, repeatRows=1)
+            table.setStyle(self.table_styles[total_style if closing else style])
+            tables.append(table)
+            if not next_chunk:
+                return tables
+            chunk = next_chunk
+
+    def document(self, title, body, note, note_space=30, as_form=False):
+        """Header + body + footer flowables of one document.
+
+        Pass as_form=True for documents going into render_merged: the header and
+        footer are then written once per merged PDF and referenced from every
+        page. A lone document gains nothing from a form (it costs an extra object),
+        so render() draws them inline.
+        """
+        return self.header(title, as_form) + body + self.footer(note, note_space, as_form)
+
+    def render(self, title, body, note, note_space=30):
+        """Build header + body + footer into an A4 PDF and return the bytes"""
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, pageCompression=1)
+        doc.build(self.document(title, body, note, note_space))
+        return buffer.getvalue()
+
+    def render_merged(self, documents):
+        """Build several documents (lists of flowables, see document()) into one A4 PDF,
+        each starting on a new page, and return the bytes.
+        Bookmark flowables in the documents become the PDF outline, shown on opening."""
+        elements = []
+        for flowables in documents:
+            if elements:
+                elements.append(PageBreak())
+            elements.extend(flowables)
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, pageCompression=1)
+        doc.build(elements, onFirstPage=lambda canvas, doc: canvas.showOutline())
+        return buffer.getvalue()
@@ -0,0 +1 @@
+"""Tests for the invoice generators; run with `python -m pytest tests` from Invoice_generation."""
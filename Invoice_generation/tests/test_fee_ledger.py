@@ -0,0 +1,98 @@
+"""The fee ledger must give invoices exactly what the workbook itself gives."""
+import sqlite3
+from contextlib import closing
+import pandas as pd
+import fee_ledger
+from Fee_completion_invoice import iter_student_fees
+from benchmarks.synthetic import make_fee_workbook
+
+def write_workbook(path, sheets):
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet_name, rows in sheets.items():
+            pd.DataFrame(rows, columns=['Student', 'Date', 'Fee', 'Paid', 'Remaining']).to_excel(
+                writer, sheet_name=sheet_name, index=False
+            )
+    return path
+
+# Refunds, corrections, undated and unparseable dates, identical payments on one day
+EDGE_SHEETS = {
+    'Class A': [
+        ['Asha', '05-06-2025', 1000, 300, 700],
+        [None, '10-06-2025', None, -50, 750],
+        [None, None, None, 200, 550],
+        [None, 'garbage', None, 100, 450],
+        ['Bala', '01-07-2025', 800, 100, 700],
+        [None, '01-07-2025', None, 100, 600],
+        [None, '02-07-2025', None, 0, 600],
+        ['Chitra', None, 500, None, 500],
+    ],
+    'Class B': [
+        ['Deepa', '15-06-2025', 1200, 400, 800],
+        [None, '01-06-2025', None, 400, 400],
+    ],
+}
+
+# The same name in two classes: two students, two invoices
+SAME_NAME_SHEETS = {
+    'Class A': [['Bala', '01-07-2025', 800, 100, 700], ['Asha', '05-06-2025', 1000, 300, 700]],
+    'Class B': [['Bala', '02-07-2025', 900, 450, 450], [None, '03-08-2025', None, 100, 350]],
+}
+
+def workbook_fees(workbook, detailed_report):
+    return list(iter_student_fees(workbook, detailed_report))
+
+def ledger_fees(db_path, detailed_report):
+    with closing(fee_ledger.connect(str(db_path))) as conn:
+        return fee_ledger.students_fees(conn, detailed_report)
+
+def import_into(db_path, workbook):
+    with closing(fee_ledger.connect(str(db_path))) as conn:
+        return fee_ledger.import_workbook(conn, workbook)
+
+def test_students_fees_match_workbook(tmp_path):
+    workbook = write_workbook(tmp_path / "edge.xlsx", EDGE_SHEETS)
+    import_into(tmp_path / "ledger.sqlite3", workbook)
+    for detailed_report in (False, True):
+        assert ledger_fees(tmp_path / "ledger.sqlite3", detailed_report) == workbook_fees(workbook, detailed_report)
+
+def test_synthetic_workbook_matches(tmp_path):
+    workbook = make_fee_workbook(str(tmp_path / "fees.xlsx"), sheets=3, students_per_sheet=40, payments=4)
+    import_into(tmp_path / "ledger.sqlite3", workbook)
+    assert ledger_fees(tmp_path / "ledger.sqlite3", True) == workbook_fees(workbook, True)
+
+def test_reimport_replaces_payments(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    first = write_workbook(tmp_path / "first.xlsx", EDGE_SHEETS)
+    assert import_into(db_path, first)['payments_added'] == 9
+    assert import_into(db_path, first)['payments_added'] == 0
+
+    # A newer copy with one amount corrected and one payment added
+    corrected = {sheet: [list(row) for row in rows] for sheet, rows in EDGE_SHEETS.items()}
+    corrected['Class B'][1][3] = 350
+    corrected['Class B'].append([None, '01-07-2025', None, 50, 400])
+    newer = write_workbook(tmp_path / "newer.xlsx", corrected)
+    assert import_into(db_path, newer)['payments_added'] == 1
+    assert ledger_fees(db_path, True) == workbook_fees(newer, True)
+
+    with closing(sqlite3.connect(str(db_path))) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM payments").fetchone()[0] == 10
+
+def test_same_name_in_two_classes(tmp_path):
+    workbook = write_workbook(tmp_path / "same_name.xlsx", SAME_NAME_SHEETS)
+    import_into(tmp_path / "ledger.sqlite3", workbook)
+    fees = ledger_fees(tmp_path / "ledger.sqlite3", True)
+    assert [(name, data['class_name']) for name, data in fees] == [('Bala', 'Class A'), ('Asha', 'Class A'), ('Bala', 'Class B')]
+    assert fees == workbook_fees(workbook, True)
+
+def test_import_into_copy_leaves_ledger_unchanged(tmp_path):
+    db_path = tmp_path / "ledger.sqlite3"
+    import_into(db_path, write_workbook(tmp_path / "first.xlsx", EDGE_SHEETS))
+    before = db_path.read_bytes()
+
+    newer = write_workbook(tmp_path / "newer.xlsx", {**EDGE_SHEETS, **SAME_NAME_SHEETS})
+    with closing(fee_ledger.connect_copy(str(db_path))) as conn:
+        dry_run = fee_ledger.import_workbook(conn, newer), fee_ledger.students_fees(conn, True)
+    assert db_path.read_bytes() == before
+
+    assert import_into(db_path, newer) == dry_run[0]
+    assert ledger_fees(db_path, True) == dry_run[1]
@@ -0,0 +1,61 @@
+"""Runs sharing an output directory must not lose or corrupt each other's invoices."""
+import os
+import threading
+from datetime import datetime
+import Fee_completion_invoice
+from invoice_output import InvoiceManifest, write_pdf, render_incremental
+
+def fake_render(changed):
+    for key, data in changed:
+        yield f"{key}.pdf", f"{key}:{data}".encode()
+
+def digest(key, data):
+    return f"{key}:{data}"
+
+def test_concurrent_runs_keep_every_entry(tmp_path):
+    barrier = threading.Barrier(4)
+
+    def run(prefix):
+        items = {f"{prefix}{i}": i for i in range(20)}
+        entries = render_incremental(items, str(tmp_path), digest, fake_render)
+        next(entries)
+        barrier.wait()  # every run has loaded the (empty) manifest before any saves it
+        for _ in entries:
+            pass
+
+    threads = [threading.Thread(target=run, args=(prefix,)) for prefix in "abcd"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    manifest = InvoiceManifest(str(tmp_path))
+    assert len(manifest.entries) == 80
+    assert all(manifest.lookup(key, digest(key, int(key[1:]))) for key in manifest.entries)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_entry_dropped_when_another_run_rewrites_the_pdf(tmp_path):
+    first, second = InvoiceManifest(str(tmp_path)), InvoiceManifest(str(tmp_path))
+    write_pdf(b"first", str(tmp_path), "x.pdf")
+    first.record("x", "h1", "x.pdf")
+    write_pdf(b"second", str(tmp_path), "x.pdf")
+    second.record("x", "h2", "x.pdf")
+
+    first.save()
+    assert InvoiceManifest(str(tmp_path)).lookup("x", "h1") is None
+    second.save()
+    assert InvoiceManifest(str(tmp_path)).lookup("x", "h2") == os.path.join(str(tmp_path), "x.pdf")
+
+def test_stored_invoices_are_not_reused_the_next_day(tmp_path, monkeypatch):
+    fees = {'class_name': 'Class A', 'total_fees': 1000.0, 'paid_fees': 300.0, 'remaining_fees': 700.0,
+            'payment_history': [{'date': '05-06-2025', 'amount': 300.0}]}
+    today = Fee_completion_invoice.detailed_invoice_hash("Asha", fees)
+    assert Fee_completion_invoice.detailed_invoice_hash("Asha", fees) == today
+
+    class Tomorrow(datetime):
+        @classmethod
+        def today(cls):
+            return datetime(2099, 1, 2)
+
+    monkeypatch.setattr(Fee_completion_invoice, "datetime", Tomorrow)
+    assert Fee_completion_invoice.detailed_invoice_hash("Asha", fees) != today
@@ -0,0 +1,123 @@
+import os
+import re
+import time
+from functools import lru_cache
+import numpy as np
+from constants import VILLAGE_CODE_MAPPING_ENGLISH
+from parcel_store import load_village
+
+ADJACENCY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'adjacency')
+
+# Parcels whose boundaries come within this distance (metres) are neighbours;
+# digitised survey boundaries rarely touch exactly.
+ADJACENCY_TOLERANCE_M = 0.5
+
+
+def _gat_sort_key(gat_number):
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', str(gat_number))]
+
+
+def adjacency_path(village_code):
+    return os.path.join(ADJACENCY_DIR, f"adjacency_{village_code}.npz")
+
+
+def build_village_adjacency(village_code, tolerance_m=ADJACENCY_TOLERANCE_M):
+    """
+    Builds the parcel adjacency graph of one village with an STRtree self-join.
+
+    Returns:
+        dict: {'gat_numbers', 'indptr', 'indices'} in CSR form, so the neighbours of
+            parcel i are gat_numbers[indices[indptr[i]:indptr[i + 1]]]. None if the
+            village has no parcel data.
+    """
+    village = load_village(village_code)
+    if village is None:
+        return None
+
+    geometry = village['geometry']
+    left, right = village['tree'].query(geometry, predicate='dwithin', distance=tolerance_m)
+    keep = left != right
+    left, right = left[keep], right[keep]
+
+    order = np.lexsort((right, left))
+    left, right = left[order], right[order]
+    indptr = np.zeros(len(geometry) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(left, minlength=len(geometry)), out=indptr[1:])
+
+    return {
+        'gat_numbers': village['records']['gat_number'].to_numpy(dtype=str),
+        'indptr': indptr,
+        'indices': right.astype(np.int32),
+    }
+
+
+def save_village_adjacency(village_code, adjacency):
+    os.makedirs(ADJACENCY_DIR, exist_ok=True)
+    np.savez_compressed(adjacency_path(village_code), **adjacency)
+
+
+@lru_cache(maxsize=64)
+def load_village_adjacency(village_code):
+    """
+    Loads the prebuilt adjacency graph of a village, rebuilding it in memory when
+    the file is missing or no longer matches the village's parcel records.
+    """
+    path = adjacency_path(village_code)
+    village = load_village(village_code)
+    if village is None:
+        return None
+
+    if os.path.exists(path):
+        with np.load(path, allow_pickle=False) as data:
+            adjacency = {key: data[key] for key in ('gat_numbers', 'indptr', 'indices')}
+        if np.array_equal(adjacency['gat_numbers'], village['records']['gat_number'].to_numpy(dtype=str)):
+            return adjacency
+        print(f"Adjacency for {village_code} is stale, rebuilding in memory")
+
+    return build_village_adjacency(village_code)
+
+
+def get_neighbours(village_code, gat_number):
+    """
+    Returns the gat numbers bordering `gat_number` in the given village.
+
+    Returns:
+        list of str: neighbouring gat numbers in natural order, or None if the gat
+            does not exist in the village.
+    """
+    adjacency = load_village_adjacency(village_code)
+    if adjacency is None:
+        return None
+
+    positions = np.flatnonzero(adjacency['gat_numbers'] == str(gat_number))
+    if len(positions) == 0:
+        return None
+
+    neighbours = set()
+    for pos in positions:
+        neighbour_idx = adjacency['indices'][adjacency['indptr'][pos]:adjacency['indptr'][pos + 1]]
+        neighbours.update(adjacency['gat_numbers'][neighbour_idx].tolist())
+    neighbours.discard(str(gat_number))
+    return sorted(neighbours, key=_gat_sort_key)
+
+
+def build_all_adjacency():
+    """Builds and saves the adjacency graph of every village."""
+    start = time.time()
+    total_edges = built = skipped = 0
+    for village_code, village_name in VILLAGE_CODE_MAPPING_ENGLISH.items():
+        adjacency = build_village_adjacency(village_code)
+        if adjacency is None:
+            skipped += 1
+            continue
+        save_village_adjacency(village_code, adjacency)
+        built += 1
+        total_edges += len(adjacency['indices'])
+        print(f"✓ {village_name}: {len(adjacency['gat_numbers'])} parcels, {len(adjacency['indices'])} edges")
+
+    print(f"Built adjacency for {built} villages ({total_edges} edges), skipped {skipped} without parcel data, "
+          f"in {time.time() - start:.2f} seconds")
+
+
+if __name__ == '__main__':
+    build_all_adjacency()
@@ -1,11 +1,47 @@
 import streamlit as st
 from get_gat_number_data import get_intersected_record
+from track_lookup import read_track_points, get_track_gats
+from radius_lookup import get_parcels_within_radius, MAX_RADIUS_M
+from adjacency import get_neighbours
+from lookup_workers import ShardedLookupPool
+from export_results import EXPORT_FORMATS, export_to_bytes
 from constants import VILLAGE_CODE_MAPPING_MARATHI, VILLAGE_CODE_MAPPING_ENGLISH
 import pandas as pd
 
 # Page configuration
 st.set_page_config(page_title="Gat Number Finder", layout="centered")
 
+
+@st.cache_resource
+def get_lookup_pool():
+    """One sharded worker pool per server, shared by every session."""
+    pool = ShardedLookupPool()
+    pool.warm_up()
+    return pool
+
+
+def show_export_buttons(results, base_name):
+    """
+    Format picker plus one download button. The export is only built when the
+    button is clicked, and only in the chosen format. Streamlit serves downloads
+    from memory, so the file is buffered whole rather than spooled to disk.
+    """
+    format_column, button_column = st.columns([1, 2], vertical_alignment="bottom")
+    export_format = format_column.selectbox(
+        "Export format", list(EXPORT_FORMATS), format_func=str.upper, key=f"{base_name}_format"
+    )
+    suffix, mime = EXPORT_FORMATS[export_format]
+
+    button_column.download_button(
+        f"⬇️ Download {export_format.upper()}",
+        lambda: export_to_bytes(results, export_format),
+        file_name=f"{base_name}{suffix}",
+        mime=mime,
+        key=f"{base_name}_download",
+        use_container_width=True
+    )
+
+
 # Title
 st.title("🗺️ Gat Number Finder")
 st.markdown("Enter latitude and longitude to find intersecting plot information")
@@ -78,6 +114,15 @@ else:  # Comma Separated
             latitude = None
             longitude = None
 
+search_radius = st.number_input(
+    "Nearby radius (metres)",
+    min_value=0,
+    max_value=MAX_RADIUS_M,
+    value=0,
+    step=10,
+    help="Also list every gat within this distance of the point (0 = exact point only)"
+)
+
 # Search button
 if st.button("🔍 Search", use_container_width=True):
     if latitude is None or longitude is None:
@@ -115,10 +160,85 @@ if st.button("🔍 Search", use_container_width=True):
                 st.subheader("Full Record Data")
                 st.dataframe(pd.DataFrame(data, index=[0]), use_container_width=True, hide_index=True)
 
+                # Display bordering gats from the precomputed adjacency graph
+                neighbours = get_neighbours(data['village_code'], data['gat_number'])
+                st.subheader("Neighbouring Gats")
+                if neighbours:
+                    st.write(", ".join(neighbours))
+                else:
+                    st.info("No neighbouring gats found.")
+
             else:
                 st.warning("⚠️ No intersecting record found for the given coordinates.")
                 st.info("Try using different latitude/longitude values.")
 
+        if search_radius:
+            with st.spinner(f"Searching for gats within {search_radius} m..."):
+                nearby = get_parcels_within_radius(longitude, latitude, search_radius)
+
+            st.subheader(f"Gats within {search_radius} m")
+            if nearby:
+                nearby_df = pd.DataFrame(nearby)
+                nearby_df['village_marathi'] = nearby_df['village_code'].map(VILLAGE_CODE_MAPPING_MARATHI)
+                st.dataframe(nearby_df.drop(columns='parcel_idx'), use_container_width=True, hide_index=True)
+                show_export_buttons(nearby, "gats_within_radius")
+            else:
+                st.info("No gats found within the selected radius.")
+
+# Track lookup
+st.divider()
+st.subheader("🛣️ Track Lookup")
+st.markdown("Upload a GPS track (GPX, or CSV with latitude/longitude columns) to list every gat it passes through")
+
+track_file = st.file_uploader("GPS track", type=["gpx", "csv"])
+
+if st.button("🔍 Find Gats Along Track", use_container_width=True):
+    if track_file is None:
+        st.error("❌ Please upload a GPX or CSV track")
+    else:
+        with st.spinner("Tracing track through parcels..."):
+            try:
+                longitudes, latitudes = read_track_points(track_file, track_file.name)
+                visits = get_track_gats(longitudes, latitudes)
+            except Exception as e:
+                st.error(f"❌ Error reading track: {str(e)}")
+                visits = None
+
+        if visits:
+            st.success(f"✅ Track passes through {len(visits)} gat(s) ({len(longitudes)} points)")
+            track_df = pd.DataFrame(visits)
+            track_df['village_marathi'] = track_df['village_code'].map(VILLAGE_CODE_MAPPING_MARATHI)
+            st.dataframe(track_df.drop(columns='parcel_idx'), use_container_width=True, hide_index=True)
+            show_export_buttons(visits, "gats_along_track")
+        elif visits is not None:
+            st.warning("⚠️ The track does not cross any known parcel.")
+
+# Batch lookup
+st.divider()
+st.subheader("📍 Batch Lookup")
+st.markdown("Upload a CSV with latitude/longitude columns to find the gat under every point")
+
+points_file = st.file_uploader("Points CSV", type=["csv"])
+
+if st.button("🔍 Look Up All Points", use_container_width=True):
+    if points_file is None:
+        st.error("❌ Please upload a CSV of points")
+    else:
+        with st.spinner("Looking up points..."):
+            try:
+                longitudes, latitudes = read_track_points(points_file, points_file.name)
+                batch_df = get_lookup_pool().lookup(longitudes, latitudes)
+            except Exception as e:
+                st.error(f"❌ Error looking up points: {str(e)}")
+                batch_df = None
+
+        if batch_df is not None:
+            found = int(batch_df['gat_number'].notna().sum())
+            st.success(f"✅ Found gats for {found} of {len(batch_df)} point(s)")
+            batch_df['village_name'] = batch_df['village_code'].map(VILLAGE_CODE_MAPPING_ENGLISH)
+            st.dataframe(batch_df.drop(columns='parcel_idx'), use_container_width=True, hide_index=True)
+            show_export_buttons(batch_df, "gat_lookup_results")
+
 # Footer
 st.divider()
 st.markdown("""
@@ -0,0 +1,147 @@
+import io
+import csv
+import json
+from xml.sax.saxutils import escape
+import numpy as np
+import pandas as pd
+import shapely
+from parcel_store import get_parcel
+
+EXPORT_FORMATS = {
+    'geojson': ('.geojson', 'application/geo+json'),
+    'kml': ('.kml', 'application/vnd.google-earth.kml+xml'),
+    'csv': ('.csv', 'text/csv'),
+}
+
+
+def _iter_records(results):
+    """Yields lookup/query results one dict at a time, from a DataFrame or any iterable of dicts."""
+    if isinstance(results, pd.DataFrame):
+        columns = list(results.columns)
+        for row in results.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+    else:
+        yield from results
+
+
+def _clean(value):
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+        return None
+    return value
+
+
+def _properties(record):
+    # parcel_idx only addresses the stored parcel; it is not part of the exported data
+    return {key: _clean(value) for key, value in record.items() if key != 'parcel_idx'}
+
+
+def _parcel(record):
+    """Pulls the stored parcel behind a result, only when it is written out."""
+    village_code, parcel_idx = _clean(record.get('village_code')), _clean(record.get('parcel_idx'))
+    if village_code is None or parcel_idx is None:
+        return None
+    return get_parcel(village_code, int(parcel_idx))
+
+
+def iter_geojson(results):
+    """Yields a GeoJSON FeatureCollection as text chunks, one feature per result."""
+    yield '{"type":"FeatureCollection","features":['
+    for i, record in enumerate(_iter_records(results)):
+        parcel = _parcel(record)
+        geometry = parcel['geometry_geojson'] if parcel is not None and isinstance(parcel['geometry_geojson'], str) else 'null'
+        properties = json.dumps(_properties(record), ensure_ascii=False, default=str)
+        yield f'{"," if i else ""}{{"type":"Feature","geometry":{geometry},"properties":{properties}}}'
+    yield ']}'
+
+
+def _kml_ring(coords):
+    return ' '.join(f"{x},{y}" for x, y in coords)
+
+
+def _kml_geometry(wkt_text):
+    polygons = shapely.get_parts(shapely.from_wkt(wkt_text))
+    parts = []
+    for polygon in polygons:
+        rings = [f"<outerBoundaryIs><LinearRing><coordinates>{_kml_ring(polygon.exterior.coords)}</coordinates></LinearRing></outerBoundaryIs>"]
+        for interior in polygon.interiors:
+            rings.append(f"<innerBoundaryIs><LinearRing><coordinates>{_kml_ring(interior.coords)}</coordinates></LinearRing></innerBoundaryIs>")
+        parts.append(f"<Polygon>{''.join(rings)}</Polygon>")
+    if len(parts) == 1:
+        return parts[0]
+    return f"<MultiGeometry>{''.join(parts)}</MultiGeometry>"
+
+
+def iter_kml(results, name="Gat lookup results"):
+    """Yields a KML document as text chunks, one Placemark per result."""
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<kml xmlns="http://www.opengis.net/kml/2.2"><Document><name>{escape(name)}</name>\n'
+    for record in _iter_records(results):
+        properties = _properties(record)
+        data = ''.join(
+            f'<Data name="{escape(str(key))}"><value>{escape(str(value))}</value></Data>'
+            for key, value in properties.items() if value is not None
+        )
+        parcel = _parcel(record)
+        geometry = ''
+        if parcel is not None and isinstance(parcel['geometry_text_transformed'], str):
+            geometry = _kml_geometry(parcel['geometry_text_transformed'])
+        label = escape(str(properties.get('gat_number') or ''))
+        yield f'<Placemark><name>{label}</name><ExtendedData>{data}</ExtendedData>{geometry}</Placemark>\n'
+    yield '</Document></kml>\n'
+
+
+def iter_csv(results):
+    """Yields CSV text chunks: the result columns plus the parcel geometry as WKT (WGS84)."""
+    buffer = io.StringIO()
+    writer = None
+    for record in _iter_records(results):
+        properties = _properties(record)
+        if writer is None:
+            writer = csv.DictWriter(buffer, fieldnames=list(properties) + ['geometry_wkt'], extrasaction='ignore')
+            writer.writeheader()
+        parcel = _parcel(record)
+        properties['geometry_wkt'] = parcel['geometry_text_transformed'] if parcel is not None else None
+        writer.writerow(properties)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+EXPORTERS = {
+    'geojson': iter_geojson,
+    'kml': iter_kml,
+    'csv': iter_csv,
+}
+
+
+def write_export(results, export_format, out):
+    """
+    Streams results in the given format into a binary file-like object.
+
+    Returns:
+        int: number of bytes written.
+    """
+    if export_format not in EXPORTERS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    written = 0
+    if export_format == 'csv':
+        # BOM so Excel opens Marathi owner names correctly
+        written += out.write('\ufeff'.encode('utf-8'))
+    for chunk in EXPORTERS[export_format](results):
+        written += out.write(chunk.encode('utf-8'))
+    return written
+
+
+def export_to_bytes(results, export_format):
+    """
+    Builds the whole export in memory.
+
+    Returns:
+        bytes: the encoded export, as a download handler needs it.
+    """
+    out = io.BytesIO()
+    write_export(results, export_format, out)
+    return out.getvalue()
@@ -0,0 +1,191 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import shapely
+from parcel_store import to_utm, load_village, village_csv_path, get_village_index, candidate_villages
+
+# The pool is started from a Streamlit script thread; forking a threaded process can
+# deadlock the children, so start shard workers from a clean forkserver where available
+POOL_CONTEXT = multiprocessing.get_context("forkserver") if "forkserver" in multiprocessing.get_all_start_methods() else None
+
+RESULT_COLUMNS = ['longitude', 'latitude', 'gat_number', 'village_code', 'parcel_idx']
+
+# Parcels owned by this worker process, set by _init_worker
+_WORKER_SHARD = None
+
+
+def partition_villages(num_shards):
+    """
+    Splits all villages into `num_shards` groups of roughly equal parcel data size
+    (largest CSVs first onto the lightest shard).
+
+    Returns:
+        list of list: village codes per shard.
+    """
+    village_codes = get_village_index()['village_codes']
+    sizes = {
+        code: os.path.getsize(village_csv_path(code)) if os.path.exists(village_csv_path(code)) else 0
+        for code in village_codes
+    }
+    shards = [[] for _ in range(num_shards)]
+    loads = [0] * num_shards
+    for code in sorted(village_codes, key=lambda c: sizes[c], reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(code)
+        loads[lightest] += sizes[code]
+    return shards
+
+
+def _load_shard(village_codes):
+    # Bypass the parcel_store cache: a shard keeps only gat numbers and the tree
+    shard = {}
+    for village_code in village_codes:
+        village = load_village.__wrapped__(village_code)
+        if village is not None:
+            shard[village_code] = (village['records']['gat_number'].to_numpy(dtype=str), village['tree'])
+    return shard
+
+
+def _query_villages(get_village, x, y, assignments):
+    """
+    Point-in-parcel query of the points at `assignments[village_code]` positions
+    against each village's STRtree.
+
+    Returns:
+        DataFrame: point, village_code, parcel_idx, gat_number for every hit.
+    """
+    points = shapely.points(x, y)
+    hits = []
+    for village_code, positions in assignments.items():
+        village = get_village(village_code)
+        if village is None:
+            continue
+        gat_numbers, tree = village
+        point_pos, parcel_idx = tree.query(points[positions], predicate='intersects')
+        if len(point_pos) == 0:
+            continue
+        hits.append(pd.DataFrame({
+            'point': positions[point_pos],
+            'village_code': village_code,
+            'parcel_idx': parcel_idx,
+            'gat_number': gat_numbers[parcel_idx],
+        }))
+
+    if not hits:
+        return pd.DataFrame(columns=['point', 'village_code', 'parcel_idx', 'gat_number'])
+    return pd.concat(hits, ignore_index=True)
+
+
+def _init_worker(village_codes):
+    global _WORKER_SHARD
+    _WORKER_SHARD = _load_shard(village_codes)
+
+
+def _worker_query(x, y, assignments):
+    return _query_villages(_WORKER_SHARD.get, x, y, assignments)
+
+
+def _in_process_village(village_code):
+    village = load_village(village_code)
+    if village is None:
+        return None
+    return village['records']['gat_number'].to_numpy(dtype=str), village['tree']
+
+
+def _resolve_hits(longitudes, latitudes, hits):
+    """Keeps one hit per point: first village in hull-map order, then first parcel."""
+    village_rank = {code: rank for rank, code in enumerate(get_village_index()['village_codes'])}
+    result = pd.DataFrame({
+        'longitude': longitudes, 'latitude': latitudes, 'gat_number': None, 'village_code': None,
+        'parcel_idx': pd.array([pd.NA] * len(longitudes), dtype='Int64'),
+    })
+    if len(hits):
+        hits = hits.assign(rank=hits['village_code'].map(village_rank))
+        hits = hits.sort_values(['point', 'rank', 'parcel_idx']).drop_duplicates('point')
+        result.loc[hits['point'].to_numpy(), 'gat_number'] = hits['gat_number'].to_numpy()
+        result.loc[hits['point'].to_numpy(), 'village_code'] = hits['village_code'].to_numpy()
+        result.loc[hits['point'].to_numpy(), 'parcel_idx'] = hits['parcel_idx'].to_numpy(dtype=int)
+    return result[RESULT_COLUMNS]
+
+
+def lookup_points(longitudes, latitudes):
+    """
+    Batch point lookup in the current process.
+
+    Returns:
+        DataFrame: longitude, latitude, gat_number, village_code and parcel_idx (row in
+            the village's parcel store); None/NA when a point falls outside every parcel.
+    """
+    longitudes = np.asarray(longitudes, dtype=float)
+    latitudes = np.asarray(latitudes, dtype=float)
+    x, y = to_utm(longitudes, latitudes)
+    assignments = candidate_villages(shapely.points(x, y))
+    hits = _query_villages(_in_process_village, x, y, assignments)
+    return _resolve_hits(longitudes, latitudes, hits)
+
+
+class ShardedLookupPool:
+    """
+    Batch point lookup spread over worker processes, one village shard each.
+
+    Every worker loads only its own villages' parcels and STRtrees once, in its
+    initializer, so memory is split across workers instead of replicated. A batch
+    is routed to shards with the village hull index in the parent, each shard is
+    queried in parallel, and the hits are gathered back in input order.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shards = partition_villages(self.workers)
+        self.shard_of = {code: i for i, codes in enumerate(self.shards) for code in codes}
+        self.executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=POOL_CONTEXT, initializer=_init_worker, initargs=(codes,))
+            for codes in self.shards
+        ]
+
+    def warm_up(self):
+        """Starts every worker and waits for its shard to load."""
+        empty = np.array([], dtype=float)
+        for future in [executor.submit(_worker_query, empty, empty, {}) for executor in self.executors]:
+            future.result()
+
+    def lookup(self, longitudes, latitudes):
+        """Same result as `lookup_points`, computed across the worker shards."""
+        longitudes = np.asarray(longitudes, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+        x, y = to_utm(longitudes, latitudes)
+
+        shard_assignments = [{} for _ in self.shards]
+        for village_code, positions in candidate_villages(shapely.points(x, y)).items():
+            if village_code in self.shard_of:
+                shard_assignments[self.shard_of[village_code]][village_code] = positions
+
+        futures = []
+        for executor, assignments in zip(self.executors, shard_assignments):
+            if not assignments:
+                continue
+            # Ship only the points this shard needs, re-indexed locally
+            used = np.unique(np.concatenate(list(assignments.values())))
+            local = {code: np.searchsorted(used, positions) for code, positions in assignments.items()}
+            futures.append((used, executor.submit(_worker_query, x[used], y[used], local)))
+
+        hits = []
+        for used, future in futures:
+            shard_hits = future.result()
+            if len(shard_hits):
+                shard_hits['point'] = used[shard_hits['point'].to_numpy(dtype=int)]
+                hits.append(shard_hits)
+        hits = pd.concat(hits, ignore_index=True) if hits else pd.DataFrame()
+        return _resolve_hits(longitudes, latitudes, hits)
+
+    def close(self):
+        for executor in self.executors:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
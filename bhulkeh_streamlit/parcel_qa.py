@@ -0,0 +1,140 @@
+import os
+import csv
+import time
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import shapely
+from constants import VILLAGE_CODE_MAPPING_ENGLISH
+from parcel_store import load_village
+
+QA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'qa_reports')
+
+# Overlaps smaller than this (square metres) are digitising noise along shared boundaries
+MIN_OVERLAP_SQ_M = 1.0
+
+REPORT_COLUMNS = [
+    'village_code', 'village_name', 'issue', 'gat_a', 'gat_b',
+    'area_a_sq_m', 'area_b_sq_m', 'overlap_sq_m', 'overlap_pct',
+]
+
+
+def check_village(village_code, min_overlap_sq_m=MIN_OVERLAP_SQ_M):
+    """
+    Finds overlapping and duplicated parcels within one village.
+
+    Candidate pairs come from a single bulk STRtree self-join; only those pairs
+    are intersected, instead of testing every parcel against every other.
+
+    Returns:
+        list of dict: one row per problem pair, keyed by REPORT_COLUMNS. `issue` is
+            'duplicate_geometry' for identical polygons, 'duplicate_gat' for a gat
+            number recorded twice and 'overlap' otherwise.
+    """
+    village = load_village(village_code)
+    if village is None:
+        return []
+
+    village_name = VILLAGE_CODE_MAPPING_ENGLISH.get(village_code, "Unknown Village")
+    gat_numbers = village['records']['gat_number'].to_numpy(dtype=str)
+    geometry = village['geometry']
+    invalid = ~shapely.is_valid(geometry)
+    if invalid.any():
+        geometry = geometry.copy()
+        geometry[invalid] = shapely.make_valid(geometry[invalid])
+    areas = shapely.area(geometry)
+
+    left, right = village['tree'].query(geometry, predicate='intersects')
+    keep = left < right
+    left, right = left[keep], right[keep]
+
+    overlap = shapely.area(shapely.intersection(geometry[left], geometry[right]))
+    duplicate = shapely.equals_exact(
+        shapely.normalize(geometry[left]), shapely.normalize(geometry[right]), tolerance=0.01
+    )
+    flagged = duplicate | (overlap >= min_overlap_sq_m)
+
+    rows = []
+    for a, b, area_ab, is_duplicate in zip(left[flagged], right[flagged], overlap[flagged], duplicate[flagged]):
+        smaller = min(areas[a], areas[b])
+        rows.append({
+            'village_code': village_code,
+            'village_name': village_name,
+            'issue': 'duplicate_geometry' if is_duplicate else 'overlap',
+            'gat_a': str(gat_numbers[a]),
+            'gat_b': str(gat_numbers[b]),
+            'area_a_sq_m': round(float(areas[a]), 2),
+            'area_b_sq_m': round(float(areas[b]), 2),
+            'overlap_sq_m': round(float(area_ab), 2),
+            'overlap_pct': round(float(area_ab / smaller * 100), 2) if smaller else 0.0,
+        })
+
+    # Same gat number recorded more than once in the village
+    values, counts = np.unique(gat_numbers, return_counts=True)
+    for gat_number in values[counts > 1].tolist():
+        rows.append({
+            'village_code': village_code,
+            'village_name': village_name,
+            'issue': 'duplicate_gat',
+            'gat_a': gat_number,
+            'gat_b': gat_number,
+            'area_a_sq_m': '',
+            'area_b_sq_m': '',
+            'overlap_sq_m': '',
+            'overlap_pct': '',
+        })
+    return rows
+
+
+def run_qa(village_codes=None, workers=None, out_file=None):
+    """
+    Runs `check_village` over villages in parallel and writes a CSV report.
+
+    Returns:
+        tuple: (report path, list of report rows)
+    """
+    village_codes = list(village_codes or VILLAGE_CODE_MAPPING_ENGLISH.keys())
+    if out_file is None:
+        os.makedirs(QA_DIR, exist_ok=True)
+        out_file = os.path.join(QA_DIR, f"parcel_qa_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+
+    start = time.time()
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(check_village, code): code for code in village_codes}
+        for future in as_completed(futures):
+            village_code = futures[future]
+            try:
+                village_rows = future.result()
+            except Exception as e:
+                print(f"Skipping {village_code}: {e}")
+                continue
+            rows.extend(village_rows)
+            if village_rows:
+                print(f"✓ {VILLAGE_CODE_MAPPING_ENGLISH.get(village_code, village_code)}: {len(village_rows)} issue(s)")
+
+    rows.sort(key=lambda r: (r['village_name'], r['issue'], r['gat_a'], r['gat_b']))
+    with open(out_file, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    counts = {}
+    for row in rows:
+        counts[row['issue']] = counts.get(row['issue'], 0) + 1
+    print("=" * 80)
+    print(f"Checked {len(village_codes)} villages in {time.time() - start:.2f} seconds")
+    for issue, count in sorted(counts.items()):
+        print(f"  {issue}: {count}")
+    print(f"Report written to: {out_file}")
+    return out_file, rows
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report overlapping and duplicated survey parcels")
+    parser.add_argument('villages', nargs='*', help="village codes to check (default: all)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--out', default=None, help="report CSV path")
+    args = parser.parse_args()
+    run_qa(args.villages, workers=args.workers, out_file=args.out)
@@ -0,0 +1,165 @@
+import os
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+import shapely
+from shapely.strtree import STRtree
+from pyproj import Transformer
+from convex_hull_map import CONVEX_HULL_MAP
+from constants import VILLAGE_CODE_MAPPING_ENGLISH
+
+# Survey geometries in `geometry_text` are stored in UTM zone 43N (metres)
+UTM_CRS = "EPSG:32643"
+WGS84_CRS = "EPSG:4326"
+
+RECORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transformed_all_records')
+
+_TO_UTM = Transformer.from_crs(WGS84_CRS, UTM_CRS, always_xy=True)
+
+
+def to_utm(longitudes, latitudes):
+    """
+    Projects WGS84 longitude/latitude values (scalars or arrays) to UTM metres.
+
+    Returns:
+        tuple: (x, y) as numpy arrays.
+    """
+    x, y = _TO_UTM.transform(np.asarray(longitudes, dtype=float), np.asarray(latitudes, dtype=float))
+    return np.asarray(x), np.asarray(y)
+
+
+def village_csv_path(village_code):
+    village_name = VILLAGE_CODE_MAPPING_ENGLISH.get(village_code, "Unknown Village")
+    return os.path.join(RECORDS_DIR, f"transformed_gis_data_{village_code}_{village_name}.csv")
+
+
+@lru_cache(maxsize=64)
+def load_village(village_code):
+    """
+    Loads the parcels of one village and builds an STRtree over their UTM geometries.
+
+    The result is cached, so repeated queries against the same village only pay
+    for the CSV parse and tree build once per process.
+
+    Returns:
+        dict: {'village_code', 'records', 'geometry', 'tree'} or None if the CSV is
+            missing. 'records' is a DataFrame (gat_number, info, village_code and the
+            raw WGS84 geometry text) aligned with the 'geometry' array and the tree
+            indices. Gat numbers can repeat, so parcels are addressed by row position.
+    """
+    csv_file = village_csv_path(village_code)
+    if not os.path.exists(csv_file):
+        print(f"Error: CSV file not found at {csv_file}")
+        return None
+
+    df = pd.read_csv(csv_file, dtype={'gat_number': str, 'village_code': str})
+    geometry = shapely.from_wkt(df.pop('geometry_text').to_numpy())
+    df = df.reset_index(drop=True)
+    return {
+        'village_code': village_code,
+        'records': df,
+        'geometry': geometry,
+        'tree': STRtree(geometry),
+    }
+
+
+def get_parcel(village_code, parcel_idx):
+    """
+    Returns the stored record (a Series) of one parcel by its row position, as
+    carried in lookup results' `parcel_idx`, or None if it is unknown.
+    """
+    village = load_village(village_code)
+    if village is None or not 0 <= parcel_idx < len(village['records']):
+        return None
+    return village['records'].iloc[parcel_idx]
+
+
+@lru_cache(maxsize=1)
+def get_village_index():
+    """
+    Builds an STRtree over the convex hull (UTM) of every known village.
+
+    Returns:
+        dict: {'village_codes': list, 'hulls': array of polygons, 'tree': STRtree}
+    """
+    village_codes = list(CONVEX_HULL_MAP.keys())
+    hulls_4326 = shapely.from_wkt([CONVEX_HULL_MAP[code] for code in village_codes])
+    hulls = shapely.transform(hulls_4326, lambda coords: np.column_stack(to_utm(coords[:, 0], coords[:, 1])))
+    return {'village_codes': village_codes, 'hulls': hulls, 'tree': STRtree(hulls)}
+
+
+def candidate_villages(geometries_utm):
+    """
+    Returns the villages whose convex hull intersects the given UTM geometries.
+
+    Args:
+        geometries_utm: a single shapely geometry or an array of them.
+
+    Returns:
+        dict: village_code -> numpy array of indices into `geometries_utm`
+            (a single geometry is treated as index 0).
+    """
+    village_index = get_village_index()
+    geometries = np.atleast_1d(np.asarray(geometries_utm, dtype=object))
+    input_idx, hull_idx = village_index['tree'].query(geometries, predicate='intersects')
+
+    candidates = {}
+    for hull_pos in np.unique(hull_idx):
+        village_code = village_index['village_codes'][hull_pos]
+        candidates[village_code] = np.unique(input_idx[hull_idx == hull_pos])
+    return candidates
+
+
+INFO_FIELDS = {
+    'Survey No.': 'survey_no',
+    'Total Area': 'total_area',
+    'Pot kharaba': 'pot_kharaba',
+    'Owner Name': 'owner_name',
+    'Khata No.': 'khata_no',
+}
+
+
+def parse_info(info):
+    """
+    Splits the 7/12 `info` text of a parcel into one dict per khata entry.
+
+    Returns:
+        list of dict: keys from INFO_FIELDS; 'total_area' and 'pot_kharaba' as floats.
+    """
+    entries = []
+    if not isinstance(info, str):
+        return entries
+
+    for block in info.split('---------------------------------'):
+        entry = {}
+        for line in block.strip().splitlines():
+            key, _, value = line.partition(':')
+            field = INFO_FIELDS.get(key.strip())
+            if field:
+                entry[field] = value.strip()
+        if not entry:
+            continue
+        for field in ('total_area', 'pot_kharaba'):
+            try:
+                entry[field] = float(entry.get(field, 0) or 0)
+            except ValueError:
+                entry[field] = 0.0
+        entries.append(entry)
+    return entries
+
+
+def summarize_info(info):
+    """
+    Condenses parsed `info` into the area/owner fields shown with query results.
+
+    Returns:
+        dict: total_area (sum of khata holdings, hectare), owners, khata_numbers
+    """
+    entries = parse_info(info)
+    owners = list(dict.fromkeys(e['owner_name'] for e in entries if e.get('owner_name')))
+    khata_numbers = list(dict.fromkeys(e['khata_no'] for e in entries if e.get('khata_no')))
+    return {
+        'total_area': round(sum(e['total_area'] for e in entries), 4),
+        'owners': ', '.join(owners),
+        'khata_numbers': ', '.join(khata_numbers),
+    }
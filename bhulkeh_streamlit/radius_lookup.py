@@ -0,0 +1,67 @@
+import pandas as pd
+import shapely
+from constants import VILLAGE_CODE_MAPPING_ENGLISH
+from parcel_store import to_utm, load_village, candidate_villages, summarize_info
+
+MAX_RADIUS_M = 5000
+
+
+def get_parcels_within_radius(longitude, latitude, radius_m):
+    """
+    Returns all parcels within `radius_m` metres of a point, nearest first.
+
+    The point is projected to UTM and buffered in metres to pick candidate
+    villages; each village's STRtree then answers a `dwithin` query, so only
+    parcels near the point are ever measured.
+
+    Returns:
+        list of dict: gat_number, village_code, parcel_idx (row in the village's
+            parcel store), village_name, distance_m (0 when the
+            point lies inside the parcel), area_sq_m (surveyed polygon area) and the
+            total_area/owners/khata_numbers summary from the 7/12 info.
+    """
+    if radius_m < 0 or radius_m > MAX_RADIUS_M:
+        raise ValueError(f"Radius must be between 0 and {MAX_RADIUS_M} metres")
+
+    x, y = to_utm(longitude, latitude)
+    point = shapely.Point(float(x), float(y))
+
+    # buffer(0) of a point is empty, so a zero radius looks up villages by the point itself
+    search_area = point.buffer(radius_m) if radius_m > 0 else point
+
+    matches = []
+    for village_code in candidate_villages(search_area):
+        village = load_village(village_code)
+        if village is None:
+            continue
+
+        parcel_idx = village['tree'].query(point, predicate='dwithin', distance=radius_m)
+        if len(parcel_idx) == 0:
+            continue
+
+        geometry = village['geometry'][parcel_idx]
+        matches.append(pd.DataFrame({
+            'village_code': village_code,
+            'parcel_idx': parcel_idx,
+            'distance_m': shapely.distance(point, geometry),
+            'area_sq_m': shapely.area(geometry),
+        }))
+
+    if not matches:
+        return []
+
+    matches = pd.concat(matches, ignore_index=True).sort_values(['distance_m', 'village_code', 'parcel_idx'])
+
+    results = []
+    for village_code, parcel_idx, distance_m, area_sq_m in matches.itertuples(index=False):
+        record = load_village(village_code)['records'].iloc[parcel_idx]
+        results.append({
+            'gat_number': record['gat_number'],
+            'village_code': village_code,
+            'parcel_idx': int(parcel_idx),
+            'village_name': VILLAGE_CODE_MAPPING_ENGLISH.get(village_code, "Unknown Village"),
+            'distance_m': round(float(distance_m), 2),
+            'area_sq_m': round(float(area_sq_m), 2),
+            **summarize_info(record['info']),
+        })
+    return results
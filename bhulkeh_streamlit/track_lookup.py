@@ -0,0 +1,152 @@
+import os
+import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+import shapely
+from constants import VILLAGE_CODE_MAPPING_ENGLISH
+from parcel_store import to_utm, load_village, candidate_villages
+
+LATITUDE_COLUMNS = ('latitude', 'lat')
+LONGITUDE_COLUMNS = ('longitude', 'lon', 'lng', 'long')
+
+# Gaps shorter than this (metres) between two pieces of the same parcel are treated as one visit
+VISIT_JOIN_TOLERANCE_M = 0.01
+
+
+def _read_gpx_points(track_file):
+    longitudes = []
+    latitudes = []
+    for _, element in ET.iterparse(track_file, events=('end',)):
+        tag = element.tag.rsplit('}', 1)[-1]
+        if tag in ('trkpt', 'rtept'):
+            longitudes.append(float(element.get('lon')))
+            latitudes.append(float(element.get('lat')))
+            element.clear()
+    return np.array(longitudes), np.array(latitudes)
+
+
+def _read_csv_points(track_file):
+    df = pd.read_csv(track_file)
+    columns = {c.strip().lower(): c for c in df.columns}
+    lat_col = next((columns[c] for c in LATITUDE_COLUMNS if c in columns), None)
+    lon_col = next((columns[c] for c in LONGITUDE_COLUMNS if c in columns), None)
+    if lat_col is None or lon_col is None:
+        raise ValueError("CSV track must have latitude and longitude columns")
+
+    points = df[[lon_col, lat_col]].apply(pd.to_numeric, errors='coerce').dropna()
+    return points[lon_col].to_numpy(), points[lat_col].to_numpy()
+
+
+def read_track_points(track_file, file_name=None):
+    """
+    Reads GPS fixes from a GPX or CSV track, in recorded order.
+
+    Args:
+        track_file: path or file-like object (e.g. a Streamlit upload).
+        file_name (str): used to detect the format when `track_file` is file-like.
+
+    Returns:
+        tuple: (longitudes, latitudes) as numpy arrays.
+    """
+    file_name = file_name or getattr(track_file, 'name', None) or str(track_file)
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == '.gpx':
+        return _read_gpx_points(track_file)
+    if extension == '.csv':
+        return _read_csv_points(track_file)
+    raise ValueError(f"Unsupported track format: {extension or file_name}")
+
+
+def get_track_gats(longitudes, latitudes):
+    """
+    Returns every gat traversed by a GPS track, in the order it was entered.
+
+    The track is projected to UTM and split into its segments; each village's
+    STRtree is then queried once with all segments falling inside that village,
+    so the cost follows the number of segment/parcel crossings rather than the
+    number of GPS fixes times the number of parcels.
+
+    Returns:
+        list of dict: gat_number, village_code, parcel_idx (row in the village's
+            parcel store), village_name, entry_m, exit_m and
+            length_m (distances measured along the track from its first point).
+            A parcel entered more than once appears once per visit.
+    """
+    x, y = to_utm(longitudes, latitudes)
+    coords = np.column_stack([x, y])
+    if len(coords) > 1:
+        # Drop repeated fixes (GPS loggers emit them while stationary)
+        keep = np.concatenate([[True], np.any(np.diff(coords, axis=0) != 0, axis=1)])
+        coords = coords[keep]
+    if len(coords) < 2:
+        raise ValueError("Track needs at least two distinct points")
+
+    starts = coords[:-1]
+    ends = coords[1:]
+    segment_lengths = np.hypot(*(ends - starts).T)
+    segment_offsets = np.concatenate([[0.0], np.cumsum(segment_lengths)[:-1]])
+    segments = shapely.linestrings(np.stack([starts, ends], axis=1))
+
+    pieces = []
+    for village_code, segment_idx in candidate_villages(segments).items():
+        village = load_village(village_code)
+        if village is None:
+            continue
+
+        seg_pos, parcel_idx = village['tree'].query(segments[segment_idx], predicate='intersects')
+        if len(seg_pos) == 0:
+            continue
+        seg_idx = segment_idx[seg_pos]
+
+        crossings = shapely.intersection(segments[seg_idx], village['geometry'][parcel_idx])
+        parts, part_pos = shapely.get_parts(crossings, return_index=True)
+        is_line = (shapely.get_type_id(parts) == 1) & (shapely.length(parts) > 0)
+        parts, part_pos = parts[is_line], part_pos[is_line]
+        if len(parts) == 0:
+            continue
+
+        part_seg = seg_idx[part_pos]
+        direction = (ends[part_seg] - starts[part_seg]) / segment_lengths[part_seg, None]
+        first = shapely.get_coordinates(shapely.get_point(parts, 0))
+        last = shapely.get_coordinates(shapely.get_point(parts, -1))
+        t_first = np.einsum('ij,ij->i', first - starts[part_seg], direction)
+        t_last = np.einsum('ij,ij->i', last - starts[part_seg], direction)
+
+        pieces.append(pd.DataFrame({
+            'village_code': village_code,
+            'parcel_idx': parcel_idx[part_pos],
+            'entry_m': segment_offsets[part_seg] + np.minimum(t_first, t_last),
+            'exit_m': segment_offsets[part_seg] + np.maximum(t_first, t_last),
+        }))
+
+    if not pieces:
+        return []
+
+    # Merge consecutive pieces of the same parcel into one visit
+    pieces = pd.concat(pieces, ignore_index=True).sort_values(['village_code', 'parcel_idx', 'entry_m'])
+    same_parcel = (
+        (pieces['village_code'] == pieces['village_code'].shift())
+        & (pieces['parcel_idx'] == pieces['parcel_idx'].shift())
+    )
+    continues = same_parcel & (pieces['entry_m'] - pieces['exit_m'].shift() <= VISIT_JOIN_TOLERANCE_M)
+    pieces['visit'] = (~continues).cumsum()
+    visits = pieces.groupby('visit').agg(
+        village_code=('village_code', 'first'),
+        parcel_idx=('parcel_idx', 'first'),
+        entry_m=('entry_m', 'min'),
+        exit_m=('exit_m', 'max'),
+    ).sort_values('entry_m')
+
+    results = []
+    for village_code, parcel_idx, entry_m, exit_m in visits.itertuples(index=False):
+        record = load_village(village_code)['records'].iloc[parcel_idx]
+        results.append({
+            'gat_number': record['gat_number'],
+            'village_code': village_code,
+            'parcel_idx': int(parcel_idx),
+            'village_name': VILLAGE_CODE_MAPPING_ENGLISH.get(village_code, "Unknown Village"),
+            'entry_m': round(float(entry_m), 2),
+            'exit_m': round(float(exit_m), 2),
+            'length_m': round(float(exit_m - entry_m), 2),
+        })
+    return results
@@ -0,0 +1,216 @@
+"""Fee and salary analytics over cached columnar data.
+
+The fee workbook and the attendance CSVs are parsed once, with the same code
+the invoice generators use, and stored as Parquet under statistics/cache/,
+keyed by a hash of the source files. Fees can also come straight from the
+SQLite fee ledger (load_fee_store). After that every report is a vectorised
+groupby over an in-memory frame:
+
+    collection_trend(ledger)         fees collected per month
+    outstanding_by_class(balances)   unpaid fees per class
+    paid_vs_due(balances)            share of fees paid, per class and overall
+    faculty_cost_per_hour(payroll)   salary cost per class-hour
+
+    cd statistics
+    python academy_analytics.py "../Invoice_generation/AA Fee.xlsx" --rates ../Invoice_generation/payroll_rates.csv
+    python academy_analytics.py --ledger ../Invoice_generation/fee_ledger.sqlite3
+    streamlit run analytics_streamlit.py
+
+This directory deliberately has no __init__.py: it is a folder of scripts like
+Invoice_generation, and must never be importable as a package named
+"statistics" (that would shadow the standard library module).
+"""
+import io
+import os
+import sys
+import glob
+import hashlib
+import argparse
+from contextlib import closing
+import pandas as pd
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+INVOICE_DIR = os.path.join(MODULE_DIR, os.pardir, "Invoice_generation")
+CACHE_DIR = os.path.join(MODULE_DIR, "cache")
+
+# Fee and payroll parsing is shared with the invoice generators
+sys.path.insert(0, os.path.abspath(INVOICE_DIR))
+from Fee_completion_invoice import read_workbook, clean_fee_sheet, summarize_student_fees  # noqa: E402
+import attendance_payroll  # noqa: E402
+import fee_ledger  # noqa: E402
+
+# Bump when the cached frames change shape, so stale Parquet files are rebuilt
+CACHE_VERSION = 1
+
+def source_digest(*sources):
+    """Hash of the source files' contents (paths or bytes); None sources are skipped"""
+    digest = hashlib.sha256(str(CACHE_VERSION).encode())
+    for source in sources:
+        if source is None:
+            continue
+        if isinstance(source, (bytes, bytearray)):
+            digest.update(source)
+        else:
+            with open(source, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()
+
+def cached_frame(name, digest, build, cache_dir=CACHE_DIR):
+    """DataFrame `name` for the given source digest: read from Parquet, or built
+    by build() and written there. Older cache files of the same name are removed."""
+    path = os.path.join(cache_dir, f"{name}-{digest[:16]}.parquet")
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+
+    frame = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    for stale in glob.glob(os.path.join(cache_dir, f"{name}-*.parquet")):
+        if stale != path:
+            os.remove(stale)
+    return frame
+
+def build_fee_frames(excel_file):
+    """(ledger, balances) from a fee workbook.
+
+    ledger: one row per workbook row (Class, Student, Date, Fee, Paid, Remaining)
+    balances: one row per student with the totals printed on their invoice
+    """
+    sheets = {sheet: clean_fee_sheet(df) for sheet, df in read_workbook(excel_file).items()}
+
+    ledger = pd.concat(
+        [df.assign(Class=sheet) for sheet, df in sheets.items()], ignore_index=True
+    ) if sheets else pd.DataFrame(columns=['Student', 'Date', 'Fee', 'Paid', 'Remaining', 'Class'])
+    ledger['Student'] = ledger['Student'].astype(str).str.strip()
+    ledger['Class'] = ledger['Class'].astype(str)
+    for col in ('Fee', 'Paid', 'Remaining'):
+        ledger[col] = pd.to_numeric(ledger[col], errors='coerce').astype(float)
+    ledger = ledger[['Class', 'Student', 'Date', 'Fee', 'Paid', 'Remaining']]
+
+    students_fees = summarize_student_fees(sheets)
+    balances = pd.DataFrame({
+        'Student': list(students_fees),
+        'Class': [fees['class_name'] for fees in students_fees.values()],
+        'Fees': [fees['total_fees'] for fees in students_fees.values()],
+        'Paid': [fees['paid_fees'] for fees in students_fees.values()],
+        'Remaining': [fees['remaining_fees'] for fees in students_fees.values()],
+    })
+    balances['Class'] = balances['Class'].astype(str)
+    return ledger, balances
+
+def load_fee_data(excel_file, data=None, cache_dir=CACHE_DIR):
+    """(ledger, balances) for a fee workbook, parsed once and then read from Parquet.
+    data: the workbook's bytes, when excel_file is an upload rather than a path; it is
+    then parsed from the bytes and excel_file is only its name."""
+    digest = source_digest(data if data is not None else excel_file)
+    frames = {}
+
+    def build(part):
+        def build_part():
+            if not frames:
+                source = io.BytesIO(data) if data is not None else excel_file
+                frames['ledger'], frames['balances'] = build_fee_frames(source)
+            return frames[part]
+        return build_part
+
+    return (cached_frame('fee_ledger', digest, build('ledger'), cache_dir),
+            cached_frame('fee_balances', digest, build('balances'), cache_dir))
+
+def load_fee_store(db_path=fee_ledger.LEDGER_DB):
+    """(ledger, balances) as load_fee_data returns them, queried from the fee ledger.
+    The ledger has one row per recorded payment; students without payments only
+    appear in balances."""
+    with closing(fee_ledger.connect(db_path)) as conn:
+        ledger = pd.read_sql_query("""
+            SELECT c.name AS Class, s.name AS Student, p.paid_on AS Date,
+                   s.fee AS Fee, p.amount AS Paid, s.remaining AS Remaining
+            FROM payments p JOIN students s ON s.id = p.student_id JOIN classes c ON c.id = s.class_id
+            ORDER BY c.id, s.id, p.paid_on
+        """, conn)
+        balances = pd.read_sql_query("""
+            SELECT s.name AS Student, c.name AS Class, s.fee AS Fees,
+                   COALESCE(SUM(p.amount), 0) AS Paid, s.remaining AS Remaining
+            FROM students s JOIN classes c ON c.id = s.class_id LEFT JOIN payments p ON p.student_id = s.id
+            GROUP BY s.id
+            ORDER BY c.id, s.id
+        """, conn)
+    ledger['Date'] = pd.to_datetime(ledger['Date'].replace('', None), format="%Y-%m-%d")
+    # Same fallback as the invoices: no recorded payments means fee minus balance
+    balances['Paid'] = balances['Paid'].where(balances['Paid'] > 0, (balances['Fees'] - balances['Remaining']).clip(lower=0.0))
+    return ledger, balances
+
+def load_payroll(files=None, rates_file=attendance_payroll.RATES_FILE, cache_dir=CACHE_DIR):
+    """Priced attendance sessions (Date, Faculty, Class, Subject, Hours, Rate, Total)
+    for the given attendance CSVs (default: every month in Attendance_tracking)."""
+    files = attendance_payroll.attendance_files() if files is None else list(files)
+    digest = source_digest(*files, rates_file)
+
+    def build():
+        payroll = attendance_payroll.compute_payroll(
+            attendance_payroll.read_attendance(files), attendance_payroll.load_rates(rates_file)
+        )
+        return payroll[['Date', 'Faculty', 'Class', 'Subject', 'Hours', 'Rate', 'Total']]
+
+    return cached_frame('payroll', digest, build, cache_dir)
+
+def collection_trend(ledger):
+    """Fees collected per month: Month, Collected, Payments, Cumulative"""
+    payments = ledger[ledger['Paid'] > 0]
+    month = payments['Date'].dt.to_period('M').rename('Month')
+    trend = payments.groupby(month, sort=True)['Paid'].agg(Collected='sum', Payments='count').reset_index()
+    trend['Cumulative'] = trend['Collected'].cumsum()
+    trend['Month'] = trend['Month'].astype(str)
+    return trend
+
+def outstanding_by_class(balances):
+    """Outstanding fees per class, largest first: Class, Students, With dues, Outstanding"""
+    report = balances.assign(has_dues=balances['Remaining'] > 0).groupby('Class', sort=False).agg(
+        Students=('Student', 'size'),
+        with_dues=('has_dues', 'sum'),
+        Outstanding=('Remaining', 'sum'),
+    ).reset_index().rename(columns={'with_dues': 'With dues'})
+    return report.sort_values('Outstanding', ascending=False, ignore_index=True)
+
+def paid_vs_due(balances):
+    """Fees due and paid per class with the paid share, plus an 'All classes' row"""
+    report = balances.groupby('Class', sort=True)[['Fees', 'Paid', 'Remaining']].sum().reset_index()
+    overall = report[['Fees', 'Paid', 'Remaining']].sum()
+    report.loc[len(report)] = {'Class': 'All classes', **overall.to_dict()}
+    report = report.rename(columns={'Fees': 'Due'})
+    report['Paid ratio'] = (report['Paid'] / report['Due'].where(report['Due'] > 0)).round(4)
+    return report
+
+def faculty_cost_per_hour(payroll, by=('Faculty', 'Class')):
+    """Hours, salary cost and cost per class-hour, grouped by `by` (any of Faculty, Class, Subject)"""
+    report = payroll.groupby(list(by), sort=True)[['Hours', 'Total']].sum().reset_index()
+    report = report.rename(columns={'Total': 'Cost'})
+    report['Cost per hour'] = (report['Cost'] / report['Hours'].where(report['Hours'] > 0)).round(2)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print fee and salary analytics for Adhyay Academy")
+    parser.add_argument('workbook', nargs='?', help="fee workbook (.xls/.xlsx)")
+    parser.add_argument('--ledger', default=None, help="read fees from this fee ledger database instead of a workbook")
+    parser.add_argument('--attendance', nargs='*', default=None,
+                        help="attendance CSVs (default: every month in Attendance_tracking)")
+    parser.add_argument('--rates', default=attendance_payroll.RATES_FILE, help="hourly rate table for attendance")
+    args = parser.parse_args(argv)
+
+    with pd.option_context('display.width', 120, 'display.max_rows', 200):
+        if args.workbook or args.ledger:
+            ledger, balances = load_fee_store(args.ledger) if args.ledger else load_fee_data(args.workbook)
+            print("Collection trend\n", collection_trend(ledger).to_string(index=False), "\n")
+            print("Outstanding by class\n", outstanding_by_class(balances).to_string(index=False), "\n")
+            print("Paid vs due\n", paid_vs_due(balances).to_string(index=False), "\n")
+        if os.path.exists(args.rates):
+            payroll = load_payroll(args.attendance, args.rates)
+            print("Faculty cost per class-hour\n", faculty_cost_per_hour(payroll).to_string(index=False))
+        else:
+            print(f"Rate table '{args.rates}' not found; skipping faculty cost")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
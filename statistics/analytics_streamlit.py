@@ -0,0 +1,101 @@
+import streamlit as st
+import os
+import hashlib
+from contextlib import closing
+
+from academy_analytics import (
+    load_fee_data, load_fee_store, load_payroll, collection_trend, outstanding_by_class, paid_vs_due, faculty_cost_per_hour
+)
+import attendance_payroll
+import fee_ledger
+
+st.set_page_config(page_title="Adhyay Academy — Analytics", layout="wide")
+st.title("Adhyay Academy — Fee & Salary Analytics")
+
+# The Parquet cache makes a cold load fast; st.cache_data keeps the frames in memory
+# across reruns, so switching reports or filters does not touch the disk at all
+@st.cache_data(max_entries=4, show_spinner="Reading fee workbook...")
+def fee_frames(digest, name, _data):
+    return load_fee_data(name, data=_data)
+
+@st.cache_data(max_entries=4, show_spinner="Loading payroll...")
+def payroll_frame(digest, rates_file):
+    return load_payroll(rates_file=rates_file)
+
+@st.cache_data(max_entries=4, show_spinner="Loading fee ledger...")
+def store_frames(db_path, mtime_ns):
+    # mtime in the key: a new import into the ledger invalidates the cached frames
+    return load_fee_store(db_path)
+
+def attendance_digest(rates_file):
+    # Cache key for the payroll: every attendance CSV plus the rate table
+    digest = hashlib.sha256()
+    for path in attendance_payroll.attendance_files() + [rates_file]:
+        stat = os.stat(path)
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+fees_tab, salary_tab = st.tabs(["Student fees", "Faculty cost"])
+
+with fees_tab:
+    has_store = os.path.exists(fee_ledger.LEDGER_DB)
+    source = st.radio("Fee data", ("Fee ledger", "Upload workbook") if has_store else ("Upload workbook",), horizontal=True)
+    uploaded = None
+    if source == "Upload workbook":
+        uploaded = st.file_uploader("Upload fee workbook (.xls/.xlsx)", type=["xls", "xlsx"])
+    if source == "Fee ledger" or uploaded:
+        try:
+            if uploaded:
+                data = uploaded.getvalue()
+                ledger, balances = fee_frames(hashlib.sha256(data).hexdigest(), uploaded.name, data)
+            else:
+                ledger, balances = store_frames(fee_ledger.LEDGER_DB, os.stat(fee_ledger.LEDGER_DB).st_mtime_ns)
+
+            paid = paid_vs_due(balances)
+            overall = paid.iloc[-1]
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Fees due", f"Rs. {overall['Due']:,.0f}")
+            col2.metric("Collected", f"Rs. {overall['Paid']:,.0f}")
+            col3.metric("Outstanding", f"Rs. {overall['Remaining']:,.0f}")
+
+            st.subheader("Collection trend")
+            trend = collection_trend(ledger)
+            st.bar_chart(trend, x="Month", y="Collected")
+            st.dataframe(trend, hide_index=True)
+
+            st.subheader("Outstanding balance by class")
+            st.dataframe(outstanding_by_class(balances), hide_index=True)
+
+            st.subheader("Paid vs due")
+            st.dataframe(paid, hide_index=True)
+
+            if source == "Fee ledger":
+                st.subheader("Student payment history")
+                student = st.selectbox("Student", sorted(balances['Student']), index=None)
+                if student:
+                    with closing(fee_ledger.connect()) as conn:
+                        history = fee_ledger.student_history(conn, student)
+                    st.dataframe(
+                        [{'Class': class_name, 'Date': date, 'Amount (Rs.)': amount} for class_name, date, amount in history],
+                        hide_index=True
+                    )
+        except Exception as e:
+            st.error(f"Error: {e}")
+    else:
+        st.info("Upload the fee workbook to see collection and outstanding reports.")
+
+with salary_tab:
+    rates_file = attendance_payroll.RATES_FILE
+    if not os.path.exists(rates_file):
+        st.info(f"Faculty cost needs the payroll rate table ({os.path.basename(rates_file)} in Invoice_generation).")
+    elif not attendance_payroll.attendance_files():
+        st.info("No attendance files found in Attendance_tracking.")
+    else:
+        try:
+            payroll = payroll_frame(attendance_digest(rates_file), rates_file)
+            group_by = st.multiselect("Group by", ["Faculty", "Class", "Subject"], default=["Faculty", "Class"])
+            if group_by:
+                st.dataframe(faculty_cost_per_hour(payroll, by=group_by), hide_index=True)
+            st.caption(f"{len(payroll)} sessions from {payroll['Date'].min():%d-%m-%Y} to {payroll['Date'].max():%d-%m-%Y}")
+        except Exception as e:
+            st.error(f"Error: {e}")